@@ -1,5 +1,7 @@
 import Fastify from "fastify";
 import cors from "@fastify/cors";
+import type { Socket } from "net";
+import WebSocket from "ws";
 import * as db from "./db";
 
 // ──────────────────────────────────────────────────────
@@ -208,6 +210,54 @@ export function buildApp() {
     return reply.code(201).send({ ok: true });
   });
 
+  // ── Live escrow updates (WebSocket) ──
+  //
+  // Clients connect to /subscribe and send {"op":"sub","escrowId":"..."}
+  // (or "unsub"); every indexed change to a subscribed escrow is pushed
+  // as the full escrow row.
+
+  const wss = new WebSocket.Server({ noServer: true });
+
+  app.server.on("upgrade", (request, socket, head) => {
+    if (request.url?.split("?")[0] !== "/subscribe") {
+      socket.destroy();
+      return;
+    }
+    wss.handleUpgrade(request, socket as Socket, head, (ws) => wss.emit("connection", ws, request));
+  });
+
+  wss.on("connection", (ws: WebSocket) => {
+    const subscribed = new Set<string>();
+    const onEscrow = (row: any) => {
+      if (subscribed.has(row.escrow_address) && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify(row));
+      }
+    };
+    db.escrowEvents.on("escrow", onEscrow);
+
+    ws.on("message", (raw) => {
+      let msg: { op?: string; escrowId?: string | number };
+      try {
+        msg = JSON.parse(raw.toString());
+      } catch {
+        ws.send(JSON.stringify({ error: "invalid JSON" }));
+        return;
+      }
+      if (msg.escrowId === undefined || (msg.op !== "sub" && msg.op !== "unsub")) {
+        ws.send(JSON.stringify({ error: "expected {op: 'sub' | 'unsub', escrowId}" }));
+        return;
+      }
+      if (msg.op === "sub") subscribed.add(String(msg.escrowId));
+      else subscribed.delete(String(msg.escrowId));
+    });
+
+    ws.on("close", () => db.escrowEvents.off("escrow", onEscrow));
+  });
+
+  app.addHook("onClose", async () => {
+    wss.close();
+  });
+
   // ── Protocol Stats ──
 
   app.get("/stats", async () => {
@@ -1,5 +1,6 @@
 import "dotenv/config";
-import { Pool, PoolClient } from "pg";
+import { EventEmitter } from "events";
+import { Pool, PoolClient, QueryResult } from "pg";
 
 // ──────────────────────────────────────────────────────
 // Database connection pool
@@ -131,6 +132,21 @@ export async function migrate() {
   console.log("Migration complete.");
 }
 
+// ──────────────────────────────────────────────────────
+// Change feed — emits every written escrow row ("escrow")
+// for the /subscribe WebSocket channel
+// ──────────────────────────────────────────────────────
+
+export const escrowEvents = new EventEmitter();
+escrowEvents.setMaxListeners(0);
+
+function publishEscrows(result: QueryResult) {
+  for (const row of result.rows) {
+    escrowEvents.emit("escrow", row);
+  }
+  return result;
+}
+
 // ──────────────────────────────────────────────────────
 // CRUD operations
 // ──────────────────────────────────────────────────────
@@ -150,14 +166,15 @@ export async function upsertEscrow(escrow: {
   tx_signature?: string;
   chain?: string;
 }) {
-  return query(
+  const result = await query(
     `INSERT INTO escrows (
       escrow_address, client_address, provider_address, arbitrator_address,
       token_mint, amount, status, verification_type, task_hash,
       deadline, grace_period, tx_signature, chain
     ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
     ON CONFLICT (escrow_address, chain)
-    DO UPDATE SET status = $7, updated_at = NOW()`,
+    DO UPDATE SET status = $7, updated_at = NOW()
+    RETURNING *`,
     [
       escrow.escrow_address,
       escrow.client_address,
@@ -174,6 +191,7 @@ export async function upsertEscrow(escrow: {
       escrow.chain || "solana",
     ]
   );
+  return publishEscrows(result);
 }
 
 export async function updateEscrowStatus(
@@ -182,14 +200,18 @@ export async function updateEscrowStatus(
   completedAt?: Date
 ) {
   if (completedAt) {
-    return query(
-      `UPDATE escrows SET status = $1, updated_at = NOW(), completed_at = $3 WHERE escrow_address = $2`,
-      [status, escrowAddress, completedAt]
+    return publishEscrows(
+      await query(
+        `UPDATE escrows SET status = $1, updated_at = NOW(), completed_at = $3 WHERE escrow_address = $2 RETURNING *`,
+        [status, escrowAddress, completedAt]
+      )
     );
   }
-  return query(
-    `UPDATE escrows SET status = $1, updated_at = NOW() WHERE escrow_address = $2`,
-    [status, escrowAddress]
+  return publishEscrows(
+    await query(
+      `UPDATE escrows SET status = $1, updated_at = NOW() WHERE escrow_address = $2 RETURNING *`,
+      [status, escrowAddress]
+    )
   );
 }
 
@@ -1,6 +1,7 @@
 """EscrowAgent Python SDK — escrow & SLA layer for agent-to-agent transactions on Solana and Base."""
 
-from escrowagent.client import AgentVault
+from typing import TYPE_CHECKING
+
 from escrowagent.types import (
     AgentStats,
     ConfigUpdate,
@@ -15,7 +16,23 @@ from escrowagent.types import (
     VerificationType,
 )
 
+if TYPE_CHECKING:
+    from escrowagent.client import AgentVault
+
 __version__ = "0.2.0"
+
+
+def __getattr__(name: str):
+    # Lazy (PEP 562) so `import escrowagent` for the types alone never pulls in
+    # the client module or, through it, the web3 / anchorpy stacks
+    if name == "AgentVault":
+        from escrowagent.client import AgentVault
+
+        globals()["AgentVault"] = AgentVault
+        return AgentVault
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "AgentVault",
     "AgentStats",
@@ -2,15 +2,47 @@
 
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import inspect
 import json
-from datetime import datetime, timezone
-from typing import Optional
+import logging
+import os
+import time
+import warnings
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
 import httpx
+import websockets
 from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+from web3.exceptions import Web3RPCError
+from web3.providers.rpc import AsyncHTTPProvider
+from web3.providers.rpc.utils import (
+    REQUEST_RETRY_ALLOWLIST,
+    ExceptionRetryConfiguration,
+    check_if_retry_on_failure,
+)
+from web3.logs import DISCARD
 from web3.middleware import ExtraDataToPOAMiddleware
 from eth_account import Account
+from eth_hash.auto import keccak as _keccak
+
+# Every checksum address and selector below is a keccak256. Pin the C-backed
+# pycryptodome implementation up front (unless ETH_HASH_BACKEND overrides it)
+# instead of leaving it to eth-hash's lazy auto-detection.
+if not os.environ.get("ETH_HASH_BACKEND"):
+    from eth_hash.backends.pycryptodome import backend as _keccak_backend
+
+    _keccak.hasher = _keccak_backend.keccak256
+    _keccak.preimage = _keccak_backend.preimage
+elif os.environ["ETH_HASH_BACKEND"] == "pysha3":
+    warnings.warn(
+        "ETH_HASH_BACKEND=pysha3 is much slower than the default pycryptodome backend",
+        RuntimeWarning,
+        stacklevel=1,
+    )
 
 from escrowagent.types import (
     AgentStats,
@@ -23,6 +55,17 @@ from escrowagent.types import (
     TransactionResult,
     VerificationType,
 )
+from escrowagent.utils import (
+    from_epoch as _from_epoch,
+    hash_task as _hash_task,
+    json_dumps as _json_dumps,
+    json_loads as _json_loads,
+    parse_agent_stats as _parse_agent_stats,
+    parse_indexer_rows as _parse_indexer_rows,
+    send_with_record as _send_with_record,
+)
+
+logger = logging.getLogger(__name__)
 
 # ──────────────────────────────────────────────────────
 # Constants
@@ -36,6 +79,79 @@ BASE_SEPOLIA_CHAIN_ID = 84532
 USDC_BASE = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
 USDC_BASE_SEPOLIA = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
 
+MAX_UINT256 = 2**256 - 1
+
+_ZERO_ADDR = "0x" + "00" * 20
+# ABI word of the zero address (unset arbitrator / disputeRaisedBy)
+_ZERO_WORD = bytes(32)
+
+# Chains whose blocks need ExtraDataToPOAMiddleware (BSC, BSC testnet, Polygon, Mumbai)
+POA_CHAIN_IDS = frozenset({56, 97, 137, 80001})
+
+# Gas limit for createEscrow when sent right behind a still-pending approve
+# (eth_estimateGas would revert on the missing allowance)
+CREATE_ESCROW_GAS = 500_000
+
+# Calls with a bounded cost (a few storage writes plus at most four token transfers)
+# run eth_estimateGas once per method / ruling and then reuse the estimate times this.
+# Only gas used is charged, so the headroom is free; it covers recipients whose token
+# balance slot goes from zero to non-zero (+17.1k per transfer) on a later call.
+# A reverted tx sent with a reused limit drops it, so the next call estimates again.
+GAS_ESTIMATE_MULTIPLIER = 2
+
+# Send attempts for rejections that are safe to retry (rate limits, stale nonce,
+# underpriced replacement) and the base of the exponential backoff between them
+SEND_ATTEMPTS = 3
+SEND_RETRY_BACKOFF = 0.5
+
+# How long fetched EIP-1559 fee inputs are reused. maxFeePerGas = 2x base fee
+# covers five consecutive max (+12.5%) base fee increases, i.e. ~10 s of Base blocks.
+FEE_CACHE_TTL = 10.0
+
+# Multicall3 — same address on Base mainnet and Base Sepolia
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Max calls per aggregate3 request (keeps eth_call gas and response size in provider limits)
+MULTICALL_CHUNK_SIZE = 500
+
+# Max in-flight per-id getEscrow calls when Multicall3 can't be used
+RPC_CONCURRENCY = 32
+
+# Read endpoint pool (rpc_urls): seconds between eth_blockNumber latency probes,
+# per-probe timeout, and the weight of the newest sample in each endpoint's EWMA
+RPC_PROBE_INTERVAL = 15.0
+RPC_PROBE_TIMEOUT = 5.0
+RPC_LATENCY_ALPHA = 0.3
+
+# Seconds after a send during which reads stay on the primary (the node the tx
+# went to), so a lagging replica can't return pre-write state
+RPC_READ_AFTER_WRITE_WINDOW = 30.0
+
+# Read-only JSON-RPC methods that HTTPXProvider coalesces into array batches
+BATCHED_RPC_METHODS = frozenset(
+    {
+        "eth_call",
+        "eth_chainId",
+        "eth_getTransactionCount",
+        "eth_blockNumber",
+        "eth_getBlockByNumber",
+        "eth_maxPriorityFeePerGas",
+        "eth_getTransactionReceipt",
+    }
+)
+
+# Default debounce window / size cap for those batches. Hosted RPCs commonly cap
+# JSON-RPC arrays at a few dozen entries, so 20 stays under every limit we've hit.
+RPC_BATCH_WINDOW_MS = 5.0
+RPC_MAX_BATCH_SIZE = 20
+
+# HTTP statuses that mean "array batch refused" (malformed / too large): only these
+# retry the batch as single requests. 429 / 5xx go to the callers, since re-sending
+# N singles would multiply load on a node that is asking us to back off.
+RPC_BATCH_FALLBACK_STATUSES = frozenset({400, 413})
+# JSON-RPC error codes nodes use for rate limiting in a whole-batch error object
+RPC_RATE_LIMIT_CODES = frozenset({-32005, 429})
+
 # Minimal ERC-20 ABI
 ERC20_ABI = [
     {
@@ -60,6 +176,36 @@ ERC20_ABI = [
     },
 ]
 
+# Minimal Multicall3 ABI (aggregate3 only)
+MULTICALL3_ABI = [
+    {
+        "name": "aggregate3",
+        "type": "function",
+        "stateMutability": "payable",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    },
+]
+
 # EscrowAgent contract ABI (minimal for the functions we call)
 ESCROW_AGENT_ABI = [
     {
@@ -197,6 +343,21 @@ ESCROW_AGENT_ABI = [
         "inputs": [],
         "outputs": [{"name": "", "type": "uint256"}],
     },
+    {
+        "name": "EscrowCreated",
+        "type": "event",
+        "anonymous": False,
+        "inputs": [
+            {"name": "escrowId", "type": "uint256", "indexed": True},
+            {"name": "client", "type": "address", "indexed": True},
+            {"name": "provider", "type": "address", "indexed": True},
+            {"name": "amount", "type": "uint256", "indexed": False},
+            {"name": "tokenAddress", "type": "address", "indexed": False},
+            {"name": "deadline", "type": "uint64", "indexed": False},
+            {"name": "taskHash", "type": "bytes32", "indexed": False},
+            {"name": "verificationType", "type": "uint8", "indexed": False},
+        ],
+    },
 ]
 
 # ──────────────────────────────────────────────────────
@@ -216,35 +377,490 @@ PROOF_TYPE_MAP = {
     ProofType.SIGNED_CONFIRMATION: 2,
 }
 
-STATUS_MAP = {
-    0: EscrowStatus.AWAITING_PROVIDER,
-    1: EscrowStatus.ACTIVE,
-    2: EscrowStatus.PROOF_SUBMITTED,
-    3: EscrowStatus.COMPLETED,
-    4: EscrowStatus.DISPUTED,
-    5: EscrowStatus.RESOLVED,
-    6: EscrowStatus.EXPIRED,
-    7: EscrowStatus.CANCELLED,
-}
+RULING_TYPE_MAP = {"PayClient": 0, "PayProvider": 1, "Split": 2}
 
-VERIFICATION_REVERSE_MAP = {
-    0: VerificationType.ON_CHAIN,
-    1: VerificationType.ORACLE_CALLBACK,
-    2: VerificationType.MULTI_SIG_CONFIRM,
-    3: VerificationType.AUTO_RELEASE,
-}
+# Bound lookups for the write paths (SDK enum / ruling name -> contract uint8).
+# The enums are str-based, so their plain string values resolve too.
+_verification_code = VERIFICATION_TYPE_MAP.get
+_proof_code = PROOF_TYPE_MAP.get
+_ruling_code = RULING_TYPE_MAP.get
+
+# Contract enum code -> SDK enum, indexed by the uint8 value
+STATUS_BY_CODE = (
+    EscrowStatus.AWAITING_PROVIDER,
+    EscrowStatus.ACTIVE,
+    EscrowStatus.PROOF_SUBMITTED,
+    EscrowStatus.COMPLETED,
+    EscrowStatus.DISPUTED,
+    EscrowStatus.RESOLVED,
+    EscrowStatus.EXPIRED,
+    EscrowStatus.CANCELLED,
+)
+
+VERIFICATION_BY_CODE = (
+    VerificationType.ON_CHAIN,
+    VerificationType.ORACLE_CALLBACK,
+    VerificationType.MULTI_SIG_CONFIRM,
+    VerificationType.AUTO_RELEASE,
+)
+
+PROOF_BY_CODE = (
+    ProofType.TRANSACTION_SIGNATURE,
+    ProofType.ORACLE_ATTESTATION,
+    ProofType.SIGNED_CONFIRMATION,
+)
+
+
+# One char per head word of the getEscrow output tuple
+# (address,address,address,address,uint256,uint16,uint16,bytes32,uint8,uint8,
+#  uint64,uint64,uint64,uint8,uint8,bool,bytes,uint64,address), for _decode_escrow:
+# a = address, u = uint, b = bytes32, ? = bool, d = offset of dynamic bytes
+_ESCROW_FIELD_KINDS = "aaaauuubuuuuuuu?dua"
+
+# topic0 of EscrowCreated(uint256 indexed escrowId, address indexed client, address indexed provider, ...)
+ESCROW_CREATED_TOPIC = bytes(
+    AsyncWeb3.keccak(text="EscrowCreated(uint256,address,address,uint256,address,uint64,bytes32,uint8)")
+)
+
+# 4-byte selectors of the single-uint256 escrow actions (encoded by hand, see _send_uint256)
+SEL_ACCEPT = bytes(AsyncWeb3.keccak(text="acceptEscrow(uint256)")[:4])
+SEL_CONFIRM = bytes(AsyncWeb3.keccak(text="confirmCompletion(uint256)")[:4])
+SEL_CANCEL = bytes(AsyncWeb3.keccak(text="cancelEscrow(uint256)")[:4])
+SEL_RAISE_DISPUTE = bytes(AsyncWeb3.keccak(text="raiseDispute(uint256)")[:4])
+SEL_EXPIRE = bytes(AsyncWeb3.keccak(text="expireEscrow(uint256)")[:4])
+SEL_PROVIDER_RELEASE = bytes(AsyncWeb3.keccak(text="providerRelease(uint256)")[:4])
+SEL_EXPIRE_DISPUTE = bytes(AsyncWeb3.keccak(text="expireDispute(uint256)")[:4])
+SEL_SUBMIT_PROOF = bytes(AsyncWeb3.keccak(text="submitProof(uint256,uint8,bytes)")[:4])
+SEL_GET_ESCROW = bytes(AsyncWeb3.keccak(text="getEscrow(uint256)")[:4])
+
+
+def _checksum(address: str) -> str:
+    """EIP-55 checksum an address, memoized (each conversion is a keccak256)."""
+    # Key on the lowercase form so mixed-case, checksummed and ABI-decoded
+    # (lowercase) spellings of the same address share one cache entry
+    return _checksum_lower(address.lower())
+
+
+@lru_cache(maxsize=4096)
+def _checksum_lower(address: str) -> str:
+    return AsyncWeb3.to_checksum_address(address)
+
+
+def _fees(tip: int, base_fee: int) -> dict:
+    """EIP-1559 fee fields using web3's default strategy (2x base fee + tip)."""
+    return {"maxPriorityFeePerGas": tip, "maxFeePerGas": base_fee * 2 + tip}
+
+
+@dataclass(frozen=True)
+class PreparedTx:
+    """Calldata for one contract call, encoded once and reused across send attempts."""
+
+    to: str
+    data: str
+    value: int = 0
+    # Fixed gas limit; estimated per attempt when None
+    gas: Optional[int] = None
+    # Reuse the estimate cached under this key, see GAS_ESTIMATE_MULTIPLIER
+    gas_key: Optional[tuple] = None
+
+
+@dataclass
+class RpcEndpoint:
+    """One RPC node a client can read from, with its EWMA probe latency in seconds."""
+
+    url: str
+    w3: AsyncWeb3
+    contract: AsyncContract
+    multicall: AsyncContract
+    # inf until the first probe, so the primary (listed first) wins ties
+    latency: float = float("inf")
+    healthy: bool = True
+    # Contract functions used by the read paths, resolved once instead of per call
+    next_escrow_id: Any = field(init=False, repr=False)
+    aggregate3: Any = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.next_escrow_id = self.contract.functions.nextEscrowId
+        self.aggregate3 = self.multicall.functions.aggregate3
+
+    async def probe(self) -> None:
+        """Time one eth_blockNumber; a failure or timeout marks the node unhealthy."""
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self.w3.eth.block_number, RPC_PROBE_TIMEOUT)
+        except Exception:
+            self.healthy = False
+            return
+        sample = time.monotonic() - start
+        if self.latency == float("inf"):
+            self.latency = sample
+        else:
+            self.latency += RPC_LATENCY_ALPHA * (sample - self.latency)
+        self.healthy = True
+
+
+def _is_retryable_send_error(exc: Exception) -> bool:
+    """
+    Whether a failed build/broadcast can be re-sent without risking a duplicate.
+    Only errors where the node provably didn't take the tx qualify; timeouts and
+    dropped connections are ambiguous and are raised to the caller.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429
+    message = str(exc).lower()
+    return "nonce too low" in message or "replacement transaction underpriced" in message
+
+
+def _escrow_id(escrow_address: int | str) -> int:
+    """On-chain escrow id; callers may pass the int directly and skip the str parse."""
+    return escrow_address if isinstance(escrow_address, int) else int(escrow_address)
+
+
+def _address_topic(address: str) -> str:
+    """Left-pad an address to the 32-byte form it takes as an indexed log topic."""
+    return "0x" + "00" * 12 + address.lower().removeprefix("0x")
+
+
+def _get_escrow_calldata(escrow_id: int) -> bytes:
+    """getEscrow(uint256) calldata, encoded by hand."""
+    return SEL_GET_ESCROW + escrow_id.to_bytes(32, "big")
+
+
+def _submit_proof_calldata(escrow_id: int, proof_type: int, proof_data: bytes) -> str:
+    """
+    submitProof(uint256,uint8,bytes) calldata, encoded by hand into one buffer:
+    two static words, the offset (0x60) of the bytes tail, its length, then the
+    proof zero-padded to a whole word. The payload is copied once, not per ABI layer.
+    """
+    size = len(proof_data)
+    buf = bytearray(SEL_SUBMIT_PROOF)
+    buf += escrow_id.to_bytes(32, "big")
+    buf += proof_type.to_bytes(32, "big")
+    buf += (96).to_bytes(32, "big")
+    buf += size.to_bytes(32, "big")
+    buf += proof_data
+    buf += bytes(-size % 32)
+    return "0x" + buf.hex()
+
+
+def _decode_escrow(ret: bytes) -> tuple:
+    """
+    Decode raw getEscrow return data into the same tuple shape `.call()` yields.
+
+    The struct layout is fixed, so the head words are sliced directly instead
+    of going through eth_abi's generic decoder. Raises ValueError on short or
+    malformed data.
+    """
+    from_bytes = int.from_bytes
+    checksum = _checksum
+    base = from_bytes(ret[:32], "big")
+    out = []
+    append = out.append
+    pos = base
+    for kind in _ESCROW_FIELD_KINDS:
+        word = ret[pos:pos + 32]
+        if len(word) != 32:
+            raise ValueError("getEscrow return data too short")
+        pos += 32
+        if kind == "u":
+            append(from_bytes(word, "big"))
+        elif kind == "a":
+            # Unset addresses skip hex + checksum and yield the shared _ZERO_ADDR,
+            # so _parse_escrow's comparison hits the identity fast path
+            append(_ZERO_ADDR if word == _ZERO_WORD else checksum("0x" + word[12:].hex()))
+        elif kind == "b":
+            append(word)
+        elif kind == "?":
+            append(word[31] != 0)
+        else:
+            start = base + from_bytes(word, "big")
+            length = from_bytes(ret[start:start + 32], "big")
+            data = ret[start + 32:start + 32 + length]
+            if len(data) != length:
+                raise ValueError("getEscrow proof data out of bounds")
+            append(data)
+    return tuple(out)
+
+
+# web3's retry allowlist minus sends, see HTTPXProvider
+_HTTPX_RETRY_ALLOWLIST = tuple(m for m in REQUEST_RETRY_ALLOWLIST if m != "eth_sendRawTransaction")
+
+
+class HTTPXProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that sends JSON-RPC through a caller-owned httpx client.
+
+    Lets RPC and indexer traffic share one keep-alive / HTTP/2 connection pool
+    instead of web3's separate aiohttp session.
+
+    Concurrent read calls (BATCHED_RPC_METHODS) are debounced for
+    ``batch_window_ms`` and flushed as one JSON-RPC array of up to
+    ``max_batch_size`` requests, so N concurrent ``get_escrow`` / ``allowance``
+    reads cost one HTTP round trip. ``batch_window_ms=0`` disables batching.
+    Nodes that reject array batches (HTTP 400/413 or a whole-batch error object)
+    get the queued requests one by one instead; rate limits and server errors
+    are passed to the callers as they are.
+
+    web3's ``exception_retry_configuration`` still applies, per request and
+    around the batching, with httpx transport errors as the default retried
+    errors. eth_sendRawTransaction is left out of the default allowlist: a
+    send that timed out is ambiguous and is handled by _sign_and_send.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        client: httpx.AsyncClient,
+        batch_window_ms: float = RPC_BATCH_WINDOW_MS,
+        max_batch_size: int = RPC_MAX_BATCH_SIZE,
+        **kwargs: Any,
+    ):
+        kwargs.setdefault(
+            "exception_retry_configuration",
+            ExceptionRetryConfiguration(
+                errors=(httpx.TransportError,),
+                method_allowlist=_HTTPX_RETRY_ALLOWLIST,
+            ),
+        )
+        super().__init__(endpoint_uri, **kwargs)
+        self._client = client
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[Any, bytes, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # In-flight _flush tasks; the loop only holds tasks weakly
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def _post(self, request_data: bytes) -> bytes:
+        resp = await self._client.post(
+            self.endpoint_uri, content=request_data, headers=self.get_request_headers()
+        )
+        resp.raise_for_status()
+        return resp.content
+
+    async def _make_request(self, method, request_data: bytes) -> bytes:
+        retry = self.exception_retry_configuration
+        if retry is None or not check_if_retry_on_failure(method, retry.method_allowlist):
+            return await self._request(method, request_data)
+        for attempt in range(retry.retries):
+            try:
+                return await self._request(method, request_data)
+            except tuple(retry.errors):
+                if attempt + 1 == retry.retries:
+                    raise
+                await asyncio.sleep(retry.backoff_factor * 2**attempt)
+
+    async def _request(self, method, request_data: bytes) -> bytes:
+        if not self.batch_window or method not in BATCHED_RPC_METHODS:
+            return await self._post(request_data)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((_json_loads(request_data)["id"], request_data, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._schedule_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._schedule_flush)
+        return await future
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._flush(pending))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def disconnect(self) -> None:
+        """
+        Flush queued requests and wait for in-flight batches, so no caller is
+        left waiting. The httpx client is the caller's to close.
+        """
+        self._schedule_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    async def _flush(self, pending: list[tuple[Any, bytes, asyncio.Future]]) -> None:
+        """POST queued requests as one array and route each response back by id."""
+        if len(pending) == 1:
+            await self._flush_each(pending)
+            return
+        error: Optional[Exception] = None
+        try:
+            raw = await self._post(b"[" + b",".join(data for _, data, _ in pending) + b"]")
+            responses = _json_loads(raw)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in RPC_BATCH_FALLBACK_STATUSES:
+                # Batch refused outright (size cap, batches disabled) — send them one by one
+                await self._flush_each(pending)
+                return
+            error = exc
+        except Exception as exc:
+            error = exc
+        if error is not None:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        if not isinstance(responses, list):
+            rpc_error = responses.get("error") if isinstance(responses, dict) else None
+            if isinstance(rpc_error, dict) and rpc_error.get("code") in RPC_RATE_LIMIT_CODES:
+                # Rate limited: hand every caller the node's error instead of re-sending
+                for request_id, _, future in pending:
+                    if not future.done():
+                        future.set_result(_json_dumps({**responses, "id": request_id}))
+                return
+            # A single error object for the whole batch (batches unsupported) —
+            # retry the requests individually
+            await self._flush_each(pending)
+            return
+
+        by_id = {r.get("id"): r for r in responses}
+        for request_id, _, future in pending:
+            if future.done():
+                continue
+            response = by_id.get(request_id)
+            if response is None:
+                future.set_exception(
+                    RuntimeError(f"No response for JSON-RPC request {request_id} in batch")
+                )
+            else:
+                future.set_result(_json_dumps(response))
+
+    async def _flush_each(self, pending: list[tuple[Any, bytes, asyncio.Future]]) -> None:
+        async def send(data: bytes, future: asyncio.Future) -> None:
+            try:
+                raw = await self._post(data)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(raw)
+
+        await asyncio.gather(*(send(data, future) for _, data, future in pending))
+
+    async def make_batch_request(self, batch_requests: list[tuple[str, Any]]):
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        response = self.decode_rpc_response(await self._post(request_data))
+        if not isinstance(response, list):
+            # RPC errors return a single error object for the whole batch
+            return response
+        return sorted(response, key=lambda r: r.get("id", 0))
+
+
+# Shared AsyncWeb3 per (rpc_url, chain_id, event loop), each owning one pooled
+# httpx client. httpx connections are bound to the loop they were opened on, so
+# a new loop (a second asyncio.run(), per-test loops) gets its own entry.
+_W3_POOL: dict[tuple[str, int, Optional[asyncio.AbstractEventLoop]], AsyncWeb3] = {}
 
-PROOF_REVERSE_MAP = {
-    0: ProofType.TRANSACTION_SIGNATURE,
-    1: ProofType.ORACLE_ATTESTATION,
-    2: ProofType.SIGNED_CONFIRMATION,
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_shared_client(
+    rpc_url: str = BASE_MAINNET_RPC,
+    chain_id: int = BASE_CHAIN_ID,
+    batch_window_ms: float = RPC_BATCH_WINDOW_MS,
+    max_batch_size: int = RPC_MAX_BATCH_SIZE,
+) -> AsyncWeb3:
+    """
+    Process-wide AsyncWeb3 for an RPC endpoint.
+
+    Creating a BaseEscrowClient per request (e.g. in a web handler) reuses the
+    same HTTP/2 keep-alive pool instead of opening new connections and TLS
+    sessions each time. Entries are per event loop; those of closed loops are
+    dropped here. The batching options only apply when the entry is first
+    created.
+    """
+    loop = _running_loop()
+    key = (rpc_url, chain_id, loop)
+    w3 = _W3_POOL.get(key)
+    if w3 is not None:
+        if not w3.provider._client.is_closed:
+            return w3
+        _drop_contract_caches(w3)
+    for stale in [k for k in _W3_POOL if k[2] is not None and k[2].is_closed()]:
+        # Its sockets died with the loop; there is nothing left to close on it
+        _drop_contract_caches(_W3_POOL.pop(stale))
+
+    # With an explicit transport, http2 / limits must be set on it, not the client.
+    # retries=1 re-attempts a failed connect once (stale keep-alive sockets, DNS blips).
+    http = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=100, keepalive_expiry=60
+            ),
+            retries=1,
+        ),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    )
+    w3 = AsyncWeb3(
+        HTTPXProvider(
+            rpc_url, http, batch_window_ms=batch_window_ms, max_batch_size=max_batch_size
+        )
+    )
+    # Only PoA chains (BSC, Polygon) pack signer data into extraData; Base doesn't
+    if chain_id in POA_CHAIN_IDS:
+        w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+    _W3_POOL[key] = w3
+    return w3
+
+
+_CONTRACT_ABIS = {
+    "escrow": ESCROW_AGENT_ABI,
+    "erc20": ERC20_ABI,
+    "multicall": MULTICALL3_ABI,
 }
 
+# Per-w3 contract classes, so each ABI is parsed once rather than per instance / token.
+# Plain dicts: the classes reference their w3, so weak keys would never expire anyway;
+# entries are dropped together with the pooled w3 instead.
+_CONTRACT_FACTORIES: dict[AsyncWeb3, dict[str, type[AsyncContract]]] = {}
+
+# Per-w3 bound ERC-20 contracts by checksum address, shared by every client on that w3
+_TOKEN_CONTRACTS: dict[AsyncWeb3, dict[str, AsyncContract]] = {}
+
+
+def _contract_factory(w3: AsyncWeb3, name: str) -> type[AsyncContract]:
+    """Address-less contract class for one of _CONTRACT_ABIS, built once per w3."""
+    factories = _CONTRACT_FACTORIES.get(w3)
+    if factories is None:
+        factories = _CONTRACT_FACTORIES[w3] = {}
+    factory = factories.get(name)
+    if factory is None:
+        factory = factories[name] = w3.eth.contract(abi=_CONTRACT_ABIS[name])
+    return factory
+
+
+async def shutdown_all() -> None:
+    """
+    Close the shared web3 / HTTP pools get_shared_client() created for the
+    running event loop (or outside any loop). Pools of other loops are left
+    to them; those of closed loops are just dropped.
+    """
+    loop = asyncio.get_running_loop()
+    for key in list(_W3_POOL):
+        owner = key[2]
+        if owner is None or owner is loop or owner.is_closed():
+            w3 = _W3_POOL.pop(key)
+            _drop_contract_caches(w3)
+            if owner is None or owner is loop:
+                await w3.provider.disconnect()
+                await w3.provider._client.aclose()
 
-def _hash_task(description: str, criteria: list) -> bytes:
-    """SHA-256 hash of task definition."""
-    payload = json.dumps({"description": description, "criteria": criteria})
-    return hashlib.sha256(payload.encode()).digest()
+
+def _drop_contract_caches(w3: AsyncWeb3) -> None:
+    _CONTRACT_FACTORIES.pop(w3, None)
+    _TOKEN_CONTRACTS.pop(w3, None)
 
 
 class BaseEscrowClient:
@@ -260,6 +876,11 @@ class BaseEscrowClient:
             contract_address="0x...",
         )
         result = await client.create_escrow(params)
+
+    Extra ``rpc_urls`` form a read pool: they are probed in the background and
+    chain reads go to the fastest healthy node, while transactions (and the
+    nonce / fee / allowance reads that feed them) stay on ``rpc_url``. Call
+    ``close()`` to stop the probe task.
     """
 
     def __init__(
@@ -269,17 +890,52 @@ class BaseEscrowClient:
         contract_address: str = "",
         indexer_url: Optional[str] = None,
         chain_id: int = BASE_CHAIN_ID,
+        approve_max: bool = False,
+        batch_window_ms: float = RPC_BATCH_WINDOW_MS,
+        max_batch_size: int = RPC_MAX_BATCH_SIZE,
+        rpc_urls: Optional[list[str]] = None,
     ):
-        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
-        self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-        self.account = Account.from_key(private_key)
-        self.contract_address = AsyncWeb3.to_checksum_address(contract_address)
-        self.contract = self.w3.eth.contract(
-            address=self.contract_address, abi=ESCROW_AGENT_ABI
+        # Shared per RPC URL: RPC and indexer requests reuse one pooled connection set
+        self.w3 = get_shared_client(
+            rpc_url, chain_id, batch_window_ms=batch_window_ms, max_batch_size=max_batch_size
         )
+        self._http: httpx.AsyncClient = self.w3.provider._client
+        self.account = Account.from_key(private_key)
+        self.contract_address = _checksum(contract_address)
+        self.contract = _contract_factory(self.w3, "escrow")(address=self.contract_address)
+        self.multicall = _contract_factory(self.w3, "multicall")(address=MULTICALL3_ADDRESS)
         self.indexer_url = indexer_url
         self.chain_id = chain_id
-        self._http = httpx.AsyncClient(timeout=30.0)
+        # Read pool: the primary first, then any extra rpc_urls (see _reader)
+        self._endpoints = [RpcEndpoint(rpc_url, self.w3, self.contract, self.multicall)]
+        for url in rpc_urls or ():
+            if any(url == ep.url for ep in self._endpoints):
+                continue
+            w3 = get_shared_client(
+                url, chain_id, batch_window_ms=batch_window_ms, max_batch_size=max_batch_size
+            )
+            self._endpoints.append(
+                RpcEndpoint(
+                    url,
+                    w3,
+                    _contract_factory(w3, "escrow")(address=self.contract_address),
+                    _contract_factory(w3, "multicall")(address=MULTICALL3_ADDRESS),
+                )
+            )
+        self._probe_task: Optional[asyncio.Task] = None
+        self._last_write = float("-inf")
+        # Next free nonce — fetched once, then reserved locally per send (_next_nonce)
+        self._nonce: Optional[int] = None
+        self._nonce_lock = asyncio.Lock()
+        self._token_contracts = _TOKEN_CONTRACTS.setdefault(self.w3, {})
+        # Approve MAX_UINT256 once per token instead of the exact amount per escrow
+        self.approve_max = approve_max
+        # Last known (token, spender) allowance — skips the allowance() read when sufficient
+        self._allowance_cache: dict[tuple[str, str], int] = {}
+        # Reused gas limits by PreparedTx.gas_key — see GAS_ESTIMATE_MULTIPLIER
+        self._gas_cache: dict[tuple, int] = {}
+        # (fetched_at, base_fee, tip) — see _fee_params
+        self._fee_cache: Optional[tuple[float, int, int]] = None
 
     async def create_escrow(self, params: CreateEscrowParams) -> TransactionResult:
         """Create a new escrow on Base, depositing ERC-20 tokens."""
@@ -290,140 +946,156 @@ class BaseEscrowClient:
 
         deadline = params.deadline_seconds
         grace_period = params.grace_period or 300
-        verification = VERIFICATION_TYPE_MAP.get(params.verification, 2)
+        verification = _verification_code(params.verification, 2)
 
-        arbitrator = params.arbitrator or "0x" + "00" * 20
+        arbitrator = params.arbitrator or _ZERO_ADDR
 
         # Ensure approval
-        token = self.w3.eth.contract(
-            address=AsyncWeb3.to_checksum_address(params.token_mint), abi=ERC20_ABI
-        )
-        allowance = await token.functions.allowance(
-            self.account.address, self.contract_address
-        ).call()
+        token = self._token(params.token_mint)
+        allowance_key = (token.address, self.contract_address)
+        allowance = self._allowance_cache.get(allowance_key)
+        if allowance is not None and allowance < params.amount:
+            allowance = None
+        # Nonce, allowance and fee inputs in one round trip
+        allowance = await self._prefetch_create(token, allowance)
 
+        create_gas = None
         if allowance < params.amount:
-            approve_tx = await token.functions.approve(
-                self.contract_address, params.amount
-            ).build_transaction(await self._tx_params())
-            await self._send_tx(approve_tx)
-
-        # Create escrow
-        tx = await self.contract.functions.createEscrow(
-            AsyncWeb3.to_checksum_address(params.provider),
-            AsyncWeb3.to_checksum_address(arbitrator),
-            AsyncWeb3.to_checksum_address(params.token_mint),
-            params.amount,
-            deadline,
-            grace_period,
-            task_hash,
-            verification,
-            len(criteria),
-        ).build_transaction(await self._tx_params())
-
-        receipt = await self._send_tx(tx)
-
-        next_id = await self.contract.functions.nextEscrowId().call()
-        escrow_id = str(next_id - 1)
+            approve_amount = MAX_UINT256 if self.approve_max else params.amount
+            approve = PreparedTx(
+                to=token.address,
+                data=token.encode_abi("approve", args=[self.contract_address, approve_amount]),
+            )
+            # Don't wait for the approve receipt: createEscrow takes the next nonce,
+            # so it can only be mined after the approve. Its gas can't be estimated
+            # until then, so use a fixed limit.
+            approve_hash = await self._send_prepared(approve, wait=False)
+            logger.info(
+                "Sent approve %s (amount %s, token %s)",
+                approve_hash.hex(),
+                approve_amount,
+                token.address,
+            )
+            allowance = approve_amount
+            create_gas = CREATE_ESCROW_GAS
+
+        # Create escrow — encoded once, reused by every send attempt
+        create = PreparedTx(
+            to=self.contract_address,
+            data=self.contract.encode_abi(
+                "createEscrow",
+                args=[
+                    _checksum(params.provider),
+                    _checksum(arbitrator),
+                    token.address,
+                    params.amount,
+                    deadline,
+                    grace_period,
+                    task_hash,
+                    verification,
+                    len(criteria),
+                ],
+            ),
+            gas=create_gas,
+        )
+
+        try:
+            receipt = await self._send_prepared(create)
+        except Exception:
+            self._allowance_cache.pop(allowance_key, None)
+            raise
+        # createEscrow pulls `amount` via transferFrom
+        self._allowance_cache[allowance_key] = allowance - params.amount
+
+        escrow_id = self._escrow_id_from_receipt(receipt)
 
         return TransactionResult(
             signature=receipt["transactionHash"].hex(),
-            escrow_address=escrow_id,
+            escrow_address=str(escrow_id),
         )
 
-    async def accept_escrow(self, escrow_address: str) -> str:
-        tx = await self.contract.functions.acceptEscrow(
-            int(escrow_address)
-        ).build_transaction(await self._tx_params())
-        receipt = await self._send_tx(tx)
-        return receipt["transactionHash"].hex()
+    async def accept_escrow(self, escrow_address: int | str) -> str:
+        return await self._send_uint256("acceptEscrow", SEL_ACCEPT, escrow_address)
 
-    async def submit_proof(self, escrow_address: str, proof: SubmitProofParams) -> str:
-        proof_type = PROOF_TYPE_MAP.get(proof.proof_type, 0)
+    async def submit_proof(self, escrow_address: int | str, proof: SubmitProofParams) -> str:
+        proof_type = _proof_code(proof.proof_type, 0)
         proof_data = proof.data.encode() if isinstance(proof.data, str) else proof.data
 
-        tx = await self.contract.functions.submitProof(
-            int(escrow_address), proof_type, proof_data
-        ).build_transaction(await self._tx_params())
-        receipt = await self._send_tx(tx)
+        prepared = PreparedTx(
+            to=self.contract_address,
+            data=_submit_proof_calldata(_escrow_id(escrow_address), proof_type, proof_data),
+        )
+        receipt = await self._send_prepared(prepared)
         return receipt["transactionHash"].hex()
 
-    async def confirm_completion(self, escrow_address: str) -> str:
-        tx = await self.contract.functions.confirmCompletion(
-            int(escrow_address)
-        ).build_transaction(await self._tx_params())
-        receipt = await self._send_tx(tx)
-        return receipt["transactionHash"].hex()
+    async def confirm_completion(self, escrow_address: int | str) -> str:
+        return await self._send_uint256("confirmCompletion", SEL_CONFIRM, escrow_address)
 
-    async def cancel_escrow(self, escrow_address: str) -> str:
-        tx = await self.contract.functions.cancelEscrow(
-            int(escrow_address)
-        ).build_transaction(await self._tx_params())
-        receipt = await self._send_tx(tx)
-        return receipt["transactionHash"].hex()
+    async def cancel_escrow(self, escrow_address: int | str) -> str:
+        return await self._send_uint256("cancelEscrow", SEL_CANCEL, escrow_address)
 
-    async def raise_dispute(self, escrow_address: str, reason: str = "") -> str:
+    async def raise_dispute(self, escrow_address: int | str, reason: str = "") -> str:
+        # The indexer POST and the on-chain tx hit different servers; overlap them
+        # (dropped if the send fails — see _send_with_record)
+        send = self._send_uint256("raiseDispute", SEL_RAISE_DISPUTE, escrow_address)
         if self.indexer_url and reason:
-            await self._http.post(
-                f"{self.indexer_url}/disputes",
-                json={
-                    "escrowAddress": escrow_address,
-                    "raisedBy": self.account.address,
-                    "reason": reason,
-                },
-            )
+            return await _send_with_record(send, self._post_dispute_reason(escrow_address, reason))
+        return await send
 
-        tx = await self.contract.functions.raiseDispute(
-            int(escrow_address)
-        ).build_transaction(await self._tx_params())
-        receipt = await self._send_tx(tx)
-        return receipt["transactionHash"].hex()
-
-    async def resolve_dispute(self, escrow_address: str, ruling: DisputeRuling) -> str:
-        ruling_map = {"PayClient": 0, "PayProvider": 1, "Split": 2}
-        ruling_type = ruling_map.get(ruling.ruling_type, 0)
+    async def resolve_dispute(self, escrow_address: int | str, ruling: DisputeRuling) -> str:
+        ruling_type = _ruling_code(ruling.ruling_type, 0)
         client_bps = getattr(ruling, "client_bps", 0) or 0
         provider_bps = getattr(ruling, "provider_bps", 0) or 0
 
-        tx = await self.contract.functions.resolveDispute(
-            int(escrow_address), (ruling_type, client_bps, provider_bps)
-        ).build_transaction(await self._tx_params())
-        receipt = await self._send_tx(tx)
+        prepared = PreparedTx(
+            to=self.contract_address,
+            data=self.contract.encode_abi(
+                "resolveDispute",
+                args=[_escrow_id(escrow_address), (ruling_type, client_bps, provider_bps)],
+            ),
+            gas_key=("resolveDispute", ruling_type),
+        )
+        receipt = await self._send_prepared(prepared)
         return receipt["transactionHash"].hex()
 
-    async def expire_escrow(self, escrow_address: str) -> str:
+    async def expire_escrow(self, escrow_address: int | str) -> str:
         """Anyone can expire an escrow after deadline + grace period."""
-        tx = await self.contract.functions.expireEscrow(int(escrow_address)).build_transaction(
-            await self._tx_params()
-        )
-        receipt = await self._send_tx(tx)
-        return receipt["transactionHash"].hex()
+        return await self._send_uint256("expireEscrow", SEL_EXPIRE, escrow_address)
 
-    async def provider_release(self, escrow_address: str) -> str:
+    async def provider_release(self, escrow_address: int | str) -> str:
         """Provider self-releases funds after confirmation timeout."""
-        tx = await self.contract.functions.providerRelease(int(escrow_address)).build_transaction(
-            await self._tx_params()
-        )
-        receipt = await self._send_tx(tx)
-        return receipt["transactionHash"].hex()
+        return await self._send_uint256("providerRelease", SEL_PROVIDER_RELEASE, escrow_address)
 
-    async def expire_dispute(self, escrow_address: str) -> str:
+    async def expire_dispute(self, escrow_address: int | str) -> str:
         """Anyone can expire a dispute after the timeout. Refunds client."""
-        tx = await self.contract.functions.expireDispute(int(escrow_address)).build_transaction(
-            await self._tx_params()
-        )
-        receipt = await self._send_tx(tx)
-        return receipt["transactionHash"].hex()
+        return await self._send_uint256("expireDispute", SEL_EXPIRE_DISPUTE, escrow_address)
 
-    async def get_escrow(self, escrow_address: str) -> EscrowInfo:
+    async def get_escrow(self, escrow_address: int | str) -> EscrowInfo:
         if self.indexer_url:
             resp = await self._http.get(f"{self.indexer_url}/escrows/{escrow_address}")
-            data = resp.json()
+            data = _json_loads(resp.content)
             # Indexer returns {...escrow, task, proofs}; extract escrow fields
             return self._parse_indexer_escrow(data)
 
-        data = await self.contract.functions.getEscrow(int(escrow_address)).call()
-        return self._parse_escrow(escrow_address, data)
+        ret = await self._reader().w3.eth.call(
+            {"to": self.contract_address, "data": _get_escrow_calldata(_escrow_id(escrow_address))}
+        )
+        return self._parse_escrow(str(escrow_address), _decode_escrow(bytes(ret)))
+
+    async def get_escrows(self, escrow_addresses: list[int | str]) -> list[Optional[EscrowInfo]]:
+        """
+        Read many escrows from the contract in one Multicall3 ``aggregate3`` call
+        (chunked for large lists). Results follow the input order; ids that
+        don't exist or fail to decode are None.
+        """
+        ids = [_escrow_id(a) for a in escrow_addresses]
+        result: list[Optional[EscrowInfo]] = []
+        for i, data in await self._get_escrows_raw(self._reader(), ids):
+            try:
+                result.append(self._parse_escrow(str(i), data) if data is not None else None)
+            except Exception:
+                result.append(None)
+        return result
 
     async def list_escrows(
         self,
@@ -444,18 +1116,34 @@ class BaseEscrowClient:
                 params["provider"] = provider
             resp = await self._http.get(f"{self.indexer_url}/escrows", params=params)
             resp.raise_for_status()
-            return [self._parse_indexer_escrow(e) for e in resp.json()]
+            return _parse_indexer_rows(_json_loads(resp.content))
 
-        # Fall back to chain iteration
-        next_id = await self.contract.functions.nextEscrowId().call()
+        if limit <= 0:
+            return []
+        # Fall back to chain iteration, newest first, batched through Multicall3.
+        # Party filters narrow the candidate ids via EscrowCreated logs when possible.
+        # One endpoint serves the whole listing so every page sees the same head.
+        ep = self._reader()
+        ids = await self._ids_by_filter(ep, client, provider) if client or provider else None
+        if ids is None:
+            next_id = int(await ep.next_escrow_id().call())
+            ids = range(next_id - 1, 0, -1)
+        filtered = bool(status or client or provider)
+        window = min(MULTICALL_CHUNK_SIZE if filtered else limit + offset, MULTICALL_CHUNK_SIZE)
         result: list[EscrowInfo] = []
         skipped = 0
-        for i in range(int(next_id) - 1, 0, -1):
+        for start in range(0, len(ids), window):
             if len(result) >= limit:
                 break
-            try:
-                data = await self.contract.functions.getEscrow(i).call()
-                escrow = self._parse_escrow(str(i), data)
+            for i, data in await self._get_escrows_raw(ep, list(ids[start : start + window])):
+                if len(result) >= limit:
+                    break
+                if data is None:
+                    continue
+                try:
+                    escrow = self._parse_escrow(str(i), data)
+                except Exception:
+                    continue
                 if status and escrow.status.value != status:
                     continue
                 if client and escrow.client.lower() != client.lower():
@@ -466,94 +1154,442 @@ class BaseEscrowClient:
                     skipped += 1
                     continue
                 result.append(escrow)
-            except Exception:
-                continue
         return result
 
+    async def subscribe_escrow(
+        self, escrow_address: int | str, callback: Callable[[EscrowInfo], Any]
+    ) -> None:
+        """
+        Stream state changes for an escrow from the indexer's WebSocket channel.
+
+        ``callback`` (sync or async) first receives the current state, fetched over
+        HTTP, then every update pushed by the indexer. Runs until cancelled or the
+        socket closes.
+        """
+        if not self.indexer_url:
+            raise RuntimeError("Indexer URL required for subscriptions")
+        ws_url = self.indexer_url
+        if ws_url.startswith("http"):
+            ws_url = "ws" + ws_url[len("http"):]  # http -> ws, https -> wss
+
+        async def dispatch(escrow: EscrowInfo) -> None:
+            result = callback(escrow)
+            if inspect.isawaitable(result):
+                await result
+
+        async with websockets.connect(f"{ws_url}/subscribe") as ws:
+            # Subscribe before priming so no update between the two is missed
+            await ws.send(json.dumps({"op": "sub", "escrowId": str(escrow_address)}))
+            await dispatch(await self.get_escrow(escrow_address))
+            async for message in ws:
+                row = _json_loads(message)
+                if "error" in row:
+                    raise RuntimeError(f"Indexer subscription error: {row['error']}")
+                await dispatch(self._parse_indexer_escrow(row))
+
     async def get_agent_stats(self, agent_address: str) -> AgentStats:
         if not self.indexer_url:
             raise RuntimeError("Indexer URL required for agent stats")
         resp = await self._http.get(f"{self.indexer_url}/agents/{agent_address}/stats")
-        return AgentStats(**resp.json())
+        return _parse_agent_stats(_json_loads(resp.content))
 
     async def close(self):
-        await self._http.aclose()
+        """
+        Release this client and stop its endpoint probe task. The pooled web3 /
+        HTTP connections are shared with other clients on the same RPC URL and
+        stay open — call ``shutdown_all()`` at process exit to close them.
+        """
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
 
     # ── Internal helpers ──
 
+    async def _post_dispute_reason(self, escrow_address: int | str, reason: str) -> None:
+        """Record a dispute reason with the indexer; failures are logged, not raised."""
+        try:
+            resp = await self._http.post(
+                f"{self.indexer_url}/disputes",
+                json={
+                    "escrowAddress": str(escrow_address),
+                    "raisedBy": self.account.address,
+                    "reason": reason,
+                },
+            )
+            resp.raise_for_status()
+        except Exception as exc:
+            logger.warning("indexer rejected dispute reason for escrow %s: %s", escrow_address, exc)
+
+    def _reader(self) -> RpcEndpoint:
+        """
+        Endpoint for a chain read: the lowest-latency healthy one, or the
+        primary when it is the only one, every node failed its last probe, or
+        this client sent a tx in the last ``RPC_READ_AFTER_WRITE_WINDOW``
+        seconds (replicas may not have the block yet). Public reads resolve
+        it once per call. Starts the background probe task on first use.
+        """
+        endpoints = self._endpoints
+        if len(endpoints) == 1:
+            return endpoints[0]
+        if time.monotonic() - self._last_write < RPC_READ_AFTER_WRITE_WINDOW:
+            return endpoints[0]
+        if self._probe_task is None:
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_endpoints())
+        healthy = [ep for ep in endpoints if ep.healthy]
+        return min(healthy, key=lambda ep: ep.latency) if healthy else endpoints[0]
+
+    async def _probe_endpoints(self) -> None:
+        while True:
+            await asyncio.gather(*(ep.probe() for ep in self._endpoints))
+            await asyncio.sleep(RPC_PROBE_INTERVAL)
+
+    def _token(self, address: str) -> AsyncContract:
+        """ERC-20 contract handle for a token, built once per address and shared w3."""
+        address = _checksum(address)
+        token = self._token_contracts.get(address)
+        if token is None:
+            token = _contract_factory(self.w3, "erc20")(address=address)
+            self._token_contracts[address] = token
+        return token
+
     async def _tx_params(self) -> dict:
-        nonce = await self.w3.eth.get_transaction_count(self.account.address)
+        """Per-attempt tx fields: sender, chain id and EIP-1559 fees from the fee cache."""
+        # No nonce here: _sign_and_send reserves one right before signing, so a tx that
+        # fails to build (e.g. estimate_gas revert) never consumes a nonce
         return {
             "from": self.account.address,
-            "nonce": nonce,
             "chainId": self.chain_id,
+            "type": 2,
+            **await self._fee_params(),
         }
 
-    async def _send_tx(self, tx: dict) -> dict:
-        signed = self.account.sign_transaction(tx)
-        tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
-        return await self.w3.eth.wait_for_transaction_receipt(tx_hash)
+    async def _fee_params(self) -> dict:
+        """maxFeePerGas / maxPriorityFeePerGas, refreshed at most every FEE_CACHE_TTL seconds."""
+        cached = self._fee_cache
+        if cached is None or time.monotonic() - cached[0] > FEE_CACHE_TTL:
+            tip = await self.w3.eth.max_priority_fee
+            block = await self.w3.eth.get_block("latest")
+            cached = self._store_fees(block["baseFeePerGas"], tip)
+        return _fees(cached[2], cached[1])
+
+    def _store_fees(self, base_fee: int, tip: int) -> tuple[float, int, int]:
+        self._fee_cache = (time.monotonic(), base_fee, tip)
+        return self._fee_cache
+
+    def _fees_fresh(self) -> bool:
+        return (
+            self._fee_cache is not None
+            and time.monotonic() - self._fee_cache[0] <= FEE_CACHE_TTL
+        )
+
+    async def _send_uint256(
+        self, method_name: str, selector: bytes, escrow_address: int | str
+    ) -> str:
+        """
+        Send ``selector(uint256 escrowId)`` and return its tx hash. The calldata
+        is encoded by hand, without going through ContractFunction (no ABI lookup
+        or argument validation per call).
+        """
+        data = selector + _escrow_id(escrow_address).to_bytes(32, "big")
+        prepared = PreparedTx(
+            to=self.contract_address, data="0x" + data.hex(), gas_key=(method_name,)
+        )
+        receipt = await self._send_prepared(prepared)
+        return receipt["transactionHash"].hex()
+
+    async def _batch_call(self, payloads: list[tuple[str, list]]) -> list:
+        """
+        Send several JSON-RPC calls as one array request and return their
+        results in order. Raises if the batch, or any call in it, fails.
+        """
+        body = [
+            {"jsonrpc": "2.0", "method": method, "params": rpc_params, "id": i}
+            for i, (method, rpc_params) in enumerate(payloads)
+        ]
+        resp = await self._http.post(
+            self.w3.provider.endpoint_uri,
+            content=_json_dumps(body),
+            headers={"Content-Type": "application/json"},
+        )
+        resp.raise_for_status()
+        responses = _json_loads(resp.content)
+        if not isinstance(responses, list):
+            raise RuntimeError(f"JSON-RPC batch rejected: {responses}")
+        by_id = {r.get("id"): r for r in responses}
+        results = []
+        for i in range(len(payloads)):
+            response = by_id.get(i)
+            if response is None or "error" in response:
+                raise RuntimeError(f"JSON-RPC batch call {payloads[i][0]} failed: {response}")
+            results.append(response["result"])
+        return results
+
+    async def _prefetch_create(
+        self, token: AsyncContract, allowance: Optional[int]
+    ) -> int:
+        """
+        Read everything create_escrow needs before building txs — the pending
+        nonce (if not tracked yet), the token allowance (if not cached) and
+        the EIP-1559 fee inputs — as a single JSON-RPC batch. Falls back to
+        individual web3 calls if the endpoint rejects any part of the batch.
+        """
+        owner = self.account.address
+        need_nonce = self._nonce is None
+        need_fees = not self._fees_fresh()
+        keys: list[str] = []
+        payloads: list[tuple[str, list]] = []
+        if need_fees:
+            keys += ["tip", "block"]
+            payloads += [
+                ("eth_maxPriorityFeePerGas", []),
+                ("eth_getBlockByNumber", ["latest", False]),
+            ]
+        if allowance is None:
+            call = {
+                "to": token.address,
+                "data": token.encode_abi("allowance", args=[owner, self.contract_address]),
+            }
+            keys.append("allowance")
+            payloads.append(("eth_call", [call, "latest"]))
+        if need_nonce:
+            keys.append("nonce")
+            payloads.append(("eth_getTransactionCount", [owner, "pending"]))
+
+        nonce = None
+        if payloads:
+            try:
+                results = dict(zip(keys, await self._batch_call(payloads)))
+                if need_fees:
+                    base_fee = int(results["block"]["baseFeePerGas"], 16)
+                    self._store_fees(base_fee, int(results["tip"], 16))
+                if allowance is None:
+                    allowance = int(results["allowance"], 16)
+                if need_nonce:
+                    nonce = int(results["nonce"], 16)
+            except Exception:
+                if allowance is None:
+                    allowance = await token.functions.allowance(owner, self.contract_address).call()
+                # Fees and nonce are fetched individually by _fee_params / _next_nonce
+
+        if nonce is not None:
+            async with self._nonce_lock:
+                if self._nonce is None:
+                    self._nonce = nonce
+        return allowance
+
+    async def _next_nonce(self) -> int:
+        """
+        Reserve the next nonce. Seeded once from the node's pending count, then
+        handed out locally, so concurrent sends never collide and none costs an
+        eth_getTransactionCount.
+        """
+        async with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = await self.w3.eth.get_transaction_count(
+                    self.account.address, "pending"
+                )
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    def _release_nonce(self, nonce: int, resync: bool = False) -> None:
+        """Return a reserved nonce whose tx was never broadcast."""
+        if not resync and self._nonce == nonce + 1:
+            self._nonce = nonce
+        else:
+            # Out of sync with the node (e.g. txs sent elsewhere), or later nonces
+            # are already handed out — refetch the pending count on next reserve
+            self._nonce = None
+
+    async def _send_prepared(self, prepared: PreparedTx, wait: bool = True):
+        """
+        Send a prepared call and return its receipt (or just the tx hash if
+        ``wait`` is False). Only fees, gas (unless fixed or cached) and the nonce
+        are rebuilt per attempt; rejections where the tx provably wasn't accepted
+        are retried with backoff.
+        """
+        key = prepared.gas_key
+        reused = False
+        for attempt in range(SEND_ATTEMPTS):
+            try:
+                tx = {
+                    **await self._tx_params(),
+                    "to": prepared.to,
+                    "data": prepared.data,
+                    "value": prepared.value,
+                }
+                gas = prepared.gas
+                if gas is None and key is not None:
+                    gas = self._gas_cache.get(key)
+                    reused = gas is not None
+                if gas is None:
+                    gas = await self.w3.eth.estimate_gas(tx)
+                    if key is not None:
+                        self._gas_cache[key] = int(gas * GAS_ESTIMATE_MULTIPLIER)
+                tx["gas"] = gas
+                tx_hash = await self._sign_and_send(tx)
+            except Exception as e:
+                if attempt + 1 == SEND_ATTEMPTS or not _is_retryable_send_error(e):
+                    raise
+                if "underpriced" in str(e).lower():
+                    self._fee_cache = None
+                await asyncio.sleep(SEND_RETRY_BACKOFF * 2**attempt)
+                continue
+            if not wait:
+                return tx_hash
+            try:
+                return await self._wait(tx_hash)
+            except RuntimeError:
+                if reused:
+                    # Possibly out of gas (e.g. a token with transfer hooks) — re-estimate
+                    self._gas_cache.pop(key, None)
+                raise
+
+    async def _sign_and_send(self, tx: dict):
+        """Reserve a nonce, sign and broadcast a tx. Returns the tx hash without waiting."""
+        tx = {**tx, "nonce": await self._next_nonce()}
+        try:
+            signed = self.account.sign_transaction(tx)
+        except Exception:
+            self._release_nonce(tx["nonce"])
+            raise
+        try:
+            tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            message = str(e).lower()
+            # Only a node that answered and refused the tx frees the nonce. Timeouts,
+            # dropped connections and 5xx may hide an accepted tx, and a nonce clash
+            # or underpriced replacement means the node has one we don't know
+            # about — resync from the pending count in those cases
+            rejected = isinstance(e, Web3RPCError) or (
+                isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429
+            )
+            self._release_nonce(
+                tx["nonce"],
+                resync=not rejected or "nonce" in message or "underpriced" in message,
+            )
+            raise
+        self._last_write = time.monotonic()
+        return tx_hash
+
+    async def _wait(self, tx_hash):
+        """Wait for a tx receipt, raising if the tx reverted."""
+        receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt["status"] == 0:
+            # Fixed or reused gas limits skip eth_estimateGas, which surfaces reverts up front
+            raise RuntimeError(f"Transaction {tx_hash.hex()} reverted")
+        return receipt
+
+    def _escrow_id_from_receipt(self, receipt) -> int:
+        """Extract escrowId from the EscrowCreated event of a createEscrow receipt."""
+        # The token's Transfer/Approval logs in the same receipt don't match; skip them
+        for event in self.contract.events.EscrowCreated().process_receipt(receipt, errors=DISCARD):
+            if event["address"] == self.contract_address:
+                return event["args"]["escrowId"]
+        raise RuntimeError(
+            f"No EscrowCreated event in receipt {receipt['transactionHash'].hex()}"
+        )
+
+    async def _ids_by_filter(
+        self, ep: RpcEndpoint, client: Optional[str] = None, provider: Optional[str] = None
+    ) -> Optional[list[int]]:
+        """
+        Escrow ids created by ``client`` and/or for ``provider``, newest first,
+        read from EscrowCreated logs (both parties are indexed topics).
+
+        Returns None when the RPC rejects the log query (e.g. block-range caps
+        on public endpoints) so callers fall back to scanning every id. Status
+        changes after creation, so it is still filtered on the fetched escrows.
+        """
+        topics: list[Optional[str]] = [
+            "0x" + ESCROW_CREATED_TOPIC.hex(),
+            None,
+            _address_topic(client) if client else None,
+            _address_topic(provider) if provider else None,
+        ]
+        try:
+            logs = await ep.w3.eth.get_logs(
+                {
+                    "address": self.contract_address,
+                    "topics": topics,
+                    "fromBlock": 0,
+                    "toBlock": "latest",
+                }
+            )
+        except Exception:
+            return None
+        ids = {int.from_bytes(log["topics"][1], "big") for log in logs}
+        return sorted(ids, reverse=True)
+
+    async def _get_escrows_raw(
+        self, ep: RpcEndpoint, ids: list[int]
+    ) -> list[tuple[int, Optional[tuple]]]:
+        """Fetch raw getEscrow tuples for many ids from ``ep``; data is None for ids that failed."""
+        results: list[tuple[int, Optional[tuple]]] = []
+        for start in range(0, len(ids), MULTICALL_CHUNK_SIZE):
+            chunk = ids[start : start + MULTICALL_CHUNK_SIZE]
+            try:
+                results.extend(await self._multicall_get_escrows(ep, chunk))
+            except Exception:
+                # Multicall unavailable or the batch reverted — fall back to per-id calls
+                results.extend(await self._get_escrows_concurrently(ep, chunk))
+        return results
+
+    async def _get_escrows_concurrently(
+        self, ep: RpcEndpoint, ids: list[int]
+    ) -> list[tuple[int, Optional[tuple]]]:
+        """Fetch getEscrow(i) per id with bounded concurrency, preserving input order."""
+        sem = asyncio.Semaphore(RPC_CONCURRENCY)
+        w3 = ep.w3
+
+        async def fetch(i: int) -> tuple:
+            async with sem:
+                ret = await w3.eth.call(
+                    {"to": self.contract_address, "data": _get_escrow_calldata(i)}
+                )
+                return _decode_escrow(bytes(ret))
+
+        fetched = await asyncio.gather(*(fetch(i) for i in ids), return_exceptions=True)
+        return [
+            (i, None if isinstance(data, BaseException) else data)
+            for i, data in zip(ids, fetched)
+        ]
+
+    async def _multicall_get_escrows(
+        self, ep: RpcEndpoint, ids: list[int]
+    ) -> list[tuple[int, Optional[tuple]]]:
+        """Bundle getEscrow(i) for all ids into a single aggregate3 eth_call."""
+        calls = [
+            (self.contract_address, True, _get_escrow_calldata(i))
+            for i in ids
+        ]
+        returned = await ep.aggregate3(calls).call()
+        results: list[tuple[int, Optional[tuple]]] = []
+        for i, (success, ret) in zip(ids, returned):
+            results.append((i, _decode_escrow(ret) if success else None))
+        return results
 
     def _parse_escrow(self, escrow_id: str, data) -> EscrowInfo:
         return EscrowInfo(
             address=escrow_id,
             client=data[0],
             provider=data[1],
-            arbitrator=None if data[2] == "0x" + "00" * 20 else data[2],
+            arbitrator=None if data[2] == _ZERO_ADDR else data[2],
             token_mint=data[3],
             amount=data[4],
             protocol_fee_bps=data[5],
-            status=STATUS_MAP.get(data[13], EscrowStatus.AWAITING_PROVIDER),
-            verification_type=VERIFICATION_REVERSE_MAP.get(data[8], VerificationType.MULTI_SIG_CONFIRM),
+            status=STATUS_BY_CODE[data[13]] if data[13] < 8 else EscrowStatus.AWAITING_PROVIDER,
+            verification_type=(
+                VERIFICATION_BY_CODE[data[8]] if data[8] < 4 else VerificationType.MULTI_SIG_CONFIRM
+            ),
             task_hash=data[7].hex(),
-            deadline=datetime.fromtimestamp(data[11], tz=timezone.utc),
+            deadline=_from_epoch(data[11]),
             grace_period=data[12],
-            created_at=datetime.fromtimestamp(data[10], tz=timezone.utc),
-            proof_type=PROOF_REVERSE_MAP.get(data[14]) if data[15] else None,
-            proof_submitted_at=datetime.fromtimestamp(data[17], tz=timezone.utc) if data[17] > 0 else None,
+            created_at=_from_epoch(data[10]),
+            proof_type=PROOF_BY_CODE[data[14]] if data[15] and data[14] < 3 else None,
+            proof_submitted_at=_from_epoch(data[17]) if data[17] > 0 else None,
         )
 
     def _parse_indexer_escrow(self, row: dict) -> EscrowInfo:
         """Convert indexer API row to EscrowInfo."""
-        def _parse_ts(v) -> Optional[datetime]:
-            if v is None:
-                return None
-            if isinstance(v, (int, float)):
-                return datetime.fromtimestamp(int(v), tz=timezone.utc)
-            if isinstance(v, str):
-                return datetime.fromisoformat(v.replace("Z", "+00:00"))
-            return None
-
-        def _verification(s: Optional[str]) -> VerificationType:
-            if not s:
-                return VerificationType.MULTI_SIG_CONFIRM
-            for vt in VerificationType:
-                if vt.value == s:
-                    return vt
-            return VerificationType.MULTI_SIG_CONFIRM
-
-        def _proof_type(s: Optional[str]) -> Optional[ProofType]:
-            if not s:
-                return None
-            for pt in ProofType:
-                if pt.value == s:
-                    return pt
-            return None
-
-        return EscrowInfo(
-            address=row.get("escrow_address", row.get("address", "")),
-            client=row.get("client_address", row.get("client", "")),
-            provider=row.get("provider_address", row.get("provider", "")),
-            arbitrator=row.get("arbitrator_address") or row.get("arbitrator"),
-            token_mint=row.get("token_mint", ""),
-            amount=int(row.get("amount", 0)),
-            protocol_fee_bps=int(row.get("protocol_fee_bps", 0)),
-            status=EscrowStatus(row["status"]) if "status" in row else EscrowStatus.AWAITING_PROVIDER,
-            verification_type=_verification(row.get("verification_type")),
-            task_hash=row.get("task_hash", ""),
-            deadline=_parse_ts(row.get("deadline")) or datetime.now(timezone.utc),
-            grace_period=int(row.get("grace_period", 0)),
-            created_at=_parse_ts(row.get("created_at")) or datetime.now(timezone.utc),
-            proof_type=_proof_type(row.get("proof_type")),
-            proof_submitted_at=_parse_ts(row.get("proof_submitted_at")),
-        )
+        return _parse_indexer_rows((row,))[0]
@@ -38,6 +38,8 @@ class AgentVault:
         private_key: Optional[str] = None,
         contract_address: Optional[str] = None,
         chain_id: Optional[int] = None,
+        approve_max: bool = False,
+        rpc_urls: Optional[list[str]] = None,
     ):
         self.chain = chain
 
@@ -50,6 +52,8 @@ class AgentVault:
                 contract_address=contract_address or "",
                 indexer_url=indexer_url,
                 chain_id=chain_id or BASE_CHAIN_ID,
+                approve_max=approve_max,
+                rpc_urls=rpc_urls,
             )
         else:
             from escrowagent.solana import AgentVault as SolanaAgentVault
@@ -89,6 +93,9 @@ class AgentVault:
     async def get_escrow(self, escrow_address: str):
         return await self._client.get_escrow(escrow_address)
 
+    async def get_escrows(self, escrow_addresses: list):
+        return await self._client.get_escrows(escrow_addresses)
+
     async def list_escrows(
         self,
         status=None,
@@ -113,6 +120,13 @@ class AgentVault:
     async def get_agent_stats(self, agent_address: str):
         return await self._client.get_agent_stats(agent_address)
 
+    async def subscribe_escrow(self, escrow_address: str, callback):
+        return await self._client.subscribe_escrow(escrow_address, callback)
+
+    async def connect(self):
+        if hasattr(self._client, "connect"):
+            await self._client.connect()
+
     async def close(self):
         if hasattr(self._client, "close"):
             await self._client.close()
@@ -2,18 +2,32 @@
 
 from __future__ import annotations
 
-import hashlib
-import json
+import asyncio
+import logging
+import sys
 import time
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Callable, NamedTuple, Optional
 
 import httpx
 from anchorpy import Context, Idl, Program, Provider, Wallet
+from anchorpy.error import ArgsError, ProgramError
+from pyheck import snake
 from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+from solana.rpc.core import RPCException
+from solana.rpc.types import MemcmpOpts
+from solders.hash import Hash
+from solders.instruction import AccountMeta, Instruction
 from solders.keypair import Keypair
+from solders.message import Message
 from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction import VersionedTransaction
 from solders.system_program import ID as SYS_PROGRAM_ID
 from solders.sysvar import RENT
 
@@ -28,6 +42,16 @@ from escrowagent.types import (
     TransactionResult,
     VerificationType,
 )
+from escrowagent.utils import (
+    from_epoch as _from_epoch,
+    hash_task as _hash_task,
+    json_loads as _json_loads,
+    parse_agent_stats as _parse_agent_stats,
+    parse_indexer_rows as _parse_indexer_rows,
+    send_with_record as _send_with_record,
+)
+
+logger = logging.getLogger(__name__)
 
 # Default program ID (placeholder — set after deployment)
 PROGRAM_ID = Pubkey.from_string("8rXSN62qT7hb3DkcYrMmi6osPxak7nhXi2cBGDNbh7Py")
@@ -44,24 +68,75 @@ ASSOCIATED_TOKEN_PROGRAM_ID = Pubkey.from_string(
 USDC_MAINNET = Pubkey.from_string("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v")
 USDC_DEVNET = Pubkey.from_string("4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU")
 
+# PDA seed prefixes (must match the program's seeds)
+_CONFIG_SEED = b"protocol_config"
+_ESCROW_SEED = b"escrow"
+_VAULT_SEED = b"vault"
+_VAULT_AUTH_SEED = b"vault_authority"
+
+
+@lru_cache(maxsize=4096)
+def _pk(address: str) -> Pubkey:
+    """Memoized Pubkey.from_string: the same base58 addresses recur across calls."""
+    return Pubkey.from_string(address)
+
+
+@lru_cache(maxsize=4096)
+def _pk_str(pubkey: Pubkey) -> str:
+    """Memoized str(Pubkey) (base58 encode)."""
+    return str(pubkey)
+
 
-def _hash_task(description: str, criteria: list) -> bytes:
-    """SHA-256 hash of task definition."""
-    payload = json.dumps({"description": description, "criteria": criteria})
-    return hashlib.sha256(payload.encode()).digest()
+def _same_pk(value: Pubkey) -> Pubkey:
+    return value
+
+
+def _pk_via_str(value) -> Pubkey:
+    return _pk(str(value))
+
+
+# Decoded account field type -> Pubkey converter, see _coerce_pk
+_PK_COERCERS: dict[type, Callable[[object], Pubkey]] = {
+    Pubkey: _same_pk,
+    str: _pk,
+    bytes: Pubkey.from_bytes,
+}
+
+
+def _coerce_pk(value) -> Pubkey:
+    """
+    Pubkey from a decoded account field, whatever type anchorpy returned it as.
+
+    Dispatches on type(value); other types are resolved once and cached, so
+    Pubkey fields never go through a str() + base58 round trip.
+    """
+    coerce = _PK_COERCERS.get(type(value))
+    if coerce is None:
+        coerce = _PK_COERCERS[type(value)] = (
+            _same_pk if isinstance(value, Pubkey) else _pk_via_str
+        )
+    return coerce(value)
 
 
 def _derive_config_pda(program_id: Pubkey = PROGRAM_ID) -> tuple[Pubkey, int]:
     """Derive the protocol config PDA address."""
-    return Pubkey.find_program_address([b"protocol_config"], program_id)
+    return Pubkey.find_program_address([_CONFIG_SEED], program_id)
 
 
 def _derive_escrow_pda(
-    client: Pubkey, provider: Pubkey, task_hash: bytes, program_id: Pubkey = PROGRAM_ID
+    client: Pubkey | bytes,
+    provider: Pubkey | bytes,
+    task_hash: bytes,
+    program_id: Pubkey = PROGRAM_ID,
 ) -> tuple[Pubkey, int]:
-    """Derive the escrow PDA address."""
+    """
+    Derive the escrow PDA address.
+
+    Parties may be passed as raw 32-byte keys; bytes() of bytes is a no-op.
+    The seeds stay separate because each is capped at 32 bytes.
+    """
     return Pubkey.find_program_address(
-        [b"escrow", bytes(client), bytes(provider), task_hash],
+        [_ESCROW_SEED, bytes(client), bytes(provider), task_hash],
         program_id,
     )
 
@@ -70,7 +145,7 @@ def _derive_vault_pda(
     escrow: Pubkey, program_id: Pubkey = PROGRAM_ID
 ) -> tuple[Pubkey, int]:
     """Derive the vault PDA address."""
-    return Pubkey.find_program_address([b"vault", bytes(escrow)], program_id)
+    return Pubkey.find_program_address([_VAULT_SEED, bytes(escrow)], program_id)
 
 
 def _derive_vault_authority_pda(
@@ -78,14 +153,25 @@ def _derive_vault_authority_pda(
 ) -> tuple[Pubkey, int]:
     """Derive the vault authority PDA address."""
     return Pubkey.find_program_address(
-        [b"vault_authority", bytes(escrow)], program_id
+        [_VAULT_AUTH_SEED, bytes(escrow)], program_id
     )
 
 
+def _derive_with_bump(seeds: list[bytes], bump: int, program_id: Pubkey = PROGRAM_ID) -> Pubkey:
+    """Re-derive a PDA from its known bump: one hash instead of find_program_address's search."""
+    return Pubkey.create_program_address([*seeds, bytes([bump])], program_id)
+
+
+@lru_cache(maxsize=4096)
 def _get_associated_token_address(
     wallet: Pubkey, mint: Pubkey, token_program_id: Pubkey = TOKEN_PROGRAM_ID
 ) -> Pubkey:
-    """Derive the associated token account address for a wallet and mint."""
+    """
+    Derive the associated token account address for a wallet and mint.
+
+    Memoized: the same few (wallet, mint) pairs come up on every lifecycle
+    call, and each miss is a find_program_address bump search.
+    """
     return Pubkey.find_program_address(
         [
             bytes(wallet),
@@ -102,39 +188,183 @@ def _load_idl(idl_path: Optional[str] = None) -> Idl:
         idl_path = Path.cwd() / "target" / "idl" / "escrowagent.json"
     else:
         idl_path = Path(idl_path)
-    if not idl_path.exists():
+    return _read_idl(str(idl_path.resolve()))
+
+
+@lru_cache(maxsize=8)
+def _read_idl(idl_path: str) -> Idl:
+    """Parse an IDL file once per process; clients sharing an IDL share the result."""
+    path = Path(idl_path)
+    if not path.exists():
         raise FileNotFoundError(
-            f"IDL not found at {idl_path}. "
+            f"IDL not found at {path}. "
             "Provide idl_path or run from project root with built IDL."
         )
-    return Idl.from_json(idl_path.read_text())
+    return Idl.from_json(path.read_text())
+
+
+# Seconds a ProtocolConfig fee account read is reused, see _get_protocol_fee_account
+FEE_ACCOUNT_TTL = 300.0
+
+# Byte offsets of Escrow.client / Escrow.provider (after the 8-byte discriminator),
+# for getProgramAccounts memcmp filters
+ESCROW_CLIENT_OFFSET = 8
+ESCROW_PROVIDER_OFFSET = 40
+
+# Anchor IDL enum variant name -> SDK enum
+_STATUS_MAP = {
+    "awaitingProvider": EscrowStatus.AWAITING_PROVIDER,
+    "active": EscrowStatus.ACTIVE,
+    "proofSubmitted": EscrowStatus.PROOF_SUBMITTED,
+    "completed": EscrowStatus.COMPLETED,
+    "disputed": EscrowStatus.DISPUTED,
+    "resolved": EscrowStatus.RESOLVED,
+    "expired": EscrowStatus.EXPIRED,
+    "cancelled": EscrowStatus.CANCELLED,
+}
+
+
+class _EscrowAccessors(NamedTuple):
+    """Field converters for one decoded Escrow account type, see _accessors."""
+
+    variant: Callable[[object], str]
+    timestamp: Callable[[object], datetime]
+    task_hash: Callable[[object], str]
+    arbitrator: Callable[[object], Optional[str]]
+
+
+def _variant_key(value) -> str:
+    return next(iter(value))
+
+
+def _ts_number(value) -> datetime:
+    return _from_epoch(value.toNumber())
+
+
+def _ts_int(value) -> datetime:
+    return _from_epoch(int(value) if value else 0)
+
+
+def _hex(value) -> str:
+    return bytes(value).hex()
+
+
+def _no_arbitrator(value) -> None:
+    return None
+
+
+def _arbitrator_str(value) -> Optional[str]:
+    return _pk_str(value) if value else None
+
+
+def _build_accessors(data) -> _EscrowAccessors:
+    """Pick each converter from the shape of one account's fields."""
+    try:
+        bytes(data.task_hash)
+        task_hash = _hex
+    except TypeError:
+        task_hash = str
+    arbitrator = data.arbitrator
+    return _EscrowAccessors(
+        variant=_variant_key if hasattr(data.status, "keys") else str,
+        timestamp=_ts_number if hasattr(data.deadline, "toNumber") else _ts_int,
+        task_hash=task_hash,
+        arbitrator=(
+            _no_arbitrator
+            if hasattr(arbitrator, "__iter__") and not isinstance(arbitrator, (str, bytes))
+            else _arbitrator_str
+        ),
+    )
+
+
+# type(decoded account) -> its converters. Every account of a type decodes to the
+# same field shapes, so the hasattr probing runs once per type, not per record.
+_ACCESSORS: dict[type, _EscrowAccessors] = {}
+
+
+def _accessors(data) -> _EscrowAccessors:
+    acc = _ACCESSORS.get(type(data))
+    if acc is None:
+        acc = _ACCESSORS[type(data)] = _build_accessors(data)
+    return acc
+
+
+def _escrow_status(data) -> EscrowStatus:
+    return _STATUS_MAP.get(_accessors(data).variant(data.status), EscrowStatus.AWAITING_PROVIDER)
+
+
+class _EscrowParties(NamedTuple):
+    """Escrow fields fixed at creation, see AgentVault._escrow_parties."""
+
+    client: Pubkey
+    provider: Pubkey
+    token_mint: Pubkey
+
+
+class _IxTemplate(NamedTuple):
+    """Per-instruction encoding data, resolved from the IDL once, see _ix_template."""
+
+    discriminator: bytes
+    layout: object  # borsh CStruct of the instruction args
+    arg_names: tuple[str, ...]
+    # (ctx account name, is_writable, is_signer), in IDL order
+    accounts: tuple[tuple[str, bool, bool], ...]
+
+
+def _build_ix_template(program: Program, name: str) -> Optional[_IxTemplate]:
+    """None when the instruction has nested account groups (left to anchorpy)."""
+    idl_ix = program.instruction[name].idl_ix
+    accounts = []
+    for acc in idl_ix.accounts:
+        if not hasattr(acc, "is_signer"):
+            return None
+        accounts.append((snake(acc.name), acc.is_mut, acc.is_signer))
+    coder = program.coder.instruction
+    layout = coder.ix_layout[name]
+    return _IxTemplate(
+        discriminator=coder.sighashes[name],
+        layout=layout,
+        arg_names=tuple(subcon.name for subcon in layout.subcons),
+        accounts=tuple(accounts),
+    )
+
+
+# SDK enum -> Anchor IDL enum variant. Built once and shared; the encoder only reads them.
+_VERIFICATION_IDL = {
+    VerificationType.ON_CHAIN: {"onChain": {}},
+    VerificationType.ORACLE_CALLBACK: {"oracleCallback": {}},
+    VerificationType.MULTI_SIG_CONFIRM: {"multiSigConfirm": {}},
+    VerificationType.AUTO_RELEASE: {"autoRelease": {}},
+}
+_VERIFICATION_IDL_DEFAULT = _VERIFICATION_IDL[VerificationType.MULTI_SIG_CONFIRM]
+
+_PROOF_IDL = {
+    ProofType.TRANSACTION_SIGNATURE: {"transactionSignature": {}},
+    ProofType.ORACLE_ATTESTATION: {"oracleAttestation": {}},
+    ProofType.SIGNED_CONFIRMATION: {"signedConfirmation": {}},
+}
+_PROOF_IDL_DEFAULT = _PROOF_IDL[ProofType.TRANSACTION_SIGNATURE]
+
+_PAY_CLIENT_IDL = {"payClient": {}}
+_PAY_PROVIDER_IDL = {"payProvider": {}}
 
 
 def _verification_type_to_idl(value: VerificationType) -> dict:
     """Convert VerificationType enum to IDL format."""
-    return {
-        VerificationType.ON_CHAIN: {"onChain": {}},
-        VerificationType.ORACLE_CALLBACK: {"oracleCallback": {}},
-        VerificationType.MULTI_SIG_CONFIRM: {"multiSigConfirm": {}},
-        VerificationType.AUTO_RELEASE: {"autoRelease": {}},
-    }.get(value, {"multiSigConfirm": {}})
+    return _VERIFICATION_IDL.get(value, _VERIFICATION_IDL_DEFAULT)
 
 
 def _proof_type_to_idl(value: ProofType) -> dict:
     """Convert ProofType enum to IDL format."""
-    return {
-        ProofType.TRANSACTION_SIGNATURE: {"transactionSignature": {}},
-        ProofType.ORACLE_ATTESTATION: {"oracleAttestation": {}},
-        ProofType.SIGNED_CONFIRMATION: {"signedConfirmation": {}},
-    }.get(value, {"transactionSignature": {}})
+    return _PROOF_IDL.get(value, _PROOF_IDL_DEFAULT)
 
 
 def _dispute_ruling_to_idl(ruling: DisputeRuling) -> dict:
     """Convert DisputeRuling to IDL format."""
     if ruling.ruling_type == "PayClient":
-        return {"payClient": {}}
+        return _PAY_CLIENT_IDL
     if ruling.ruling_type == "PayProvider":
-        return {"payProvider": {}}
+        return _PAY_PROVIDER_IDL
     if ruling.ruling_type == "Split":
         return {"split": {"client_bps": ruling.client_bps, "provider_bps": ruling.provider_bps}}
     raise ValueError(f"Unknown ruling type: {ruling.ruling_type}")
@@ -186,86 +416,145 @@ class AgentVault:
         self.rpc_url = rpc_url
         self.keypair = keypair
         self.pubkey = keypair.pubkey()
+        self._pubkey_bytes = bytes(self.pubkey)
         self.indexer_url = indexer_url
         self.program_id = program_id or PROGRAM_ID
         self.idl_path = idl_path
         self.protocol_fee_account = protocol_fee_account
-        self._http = httpx.AsyncClient(timeout=30.0)
+        # Indexer calls cluster around lifecycle ops: multiplex them over one
+        # kept-alive HTTP/2 connection instead of a fresh HTTP/1.1 handshake each
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
         self._program: Optional[Program] = None
         self._provider: Optional[Provider] = None
         self._connection: Optional[AsyncClient] = None
+        # program_id is fixed per client, so the config PDA is derived once
+        self._config_pda, _ = _derive_config_pda(self.program_id)
+        # escrow -> (vault, vault_authority) PDAs, see _vault_pdas
+        self._pda_cache: dict[Pubkey, tuple[Pubkey, Pubkey]] = {}
+        # escrow -> parties/mint; none of them change after creation
+        self._escrow_static_cache: dict[Pubkey, _EscrowParties] = {}
+        # (fee account, time.monotonic() of the read)
+        self._fee_account_cache: Optional[tuple[Pubkey, float]] = None
+        # instruction name -> _IxTemplate (None: encode through anchorpy)
+        self._ix_templates: dict[str, Optional[_IxTemplate]] = {}
+        self._idl_errors: Optional[dict[int, str]] = None
 
     async def _get_program(self) -> Program:
         """Lazily initialize and return the Anchor Program instance."""
         if self._program is not None:
             return self._program
 
+        idl = None
+        if self.idl_path is not None:
+            # File read + IDL parse are blocking; keep them off the event loop
+            idl = await asyncio.to_thread(_load_idl, self.idl_path)
+            if self._program is not None:
+                return self._program
+
         self._connection = AsyncClient(self.rpc_url)
         wallet = Wallet(self.keypair)
         self._provider = Provider(self._connection, wallet)
 
-        if self.idl_path is not None:
-            idl = _load_idl(self.idl_path)
+        if idl is not None:
             self._program = Program(idl, self.program_id, self._provider)
         else:
             self._program = await Program.at(self.program_id, self._provider)
         return self._program
 
     async def _get_protocol_fee_account(self) -> Pubkey:
-        """Fetch protocol fee account from config if not provided."""
+        """
+        Fetch protocol fee account from config if not provided.
+
+        The read is reused for FEE_ACCOUNT_TTL seconds; if a refresh fails, the
+        last known account is used rather than failing the lifecycle call.
+        """
         if self.protocol_fee_account is not None:
             return self.protocol_fee_account
+        cached = self._fee_account_cache
+        if cached is not None and time.monotonic() - cached[1] < FEE_ACCOUNT_TTL:
+            return cached[0]
         program = await self._get_program()
-        config_pda, _ = _derive_config_pda(self.program_id)
-        config = await program.account["ProtocolConfig"].fetch(config_pda)
-        fee_authority = config.feeAuthority
-        return fee_authority if isinstance(fee_authority, Pubkey) else Pubkey.from_string(str(fee_authority))
+        try:
+            config = await program.account["ProtocolConfig"].fetch(self._config_pda)
+        except Exception:
+            if cached is None:
+                raise
+            return cached[0]
+        fee_account = _coerce_pk(config.fee_authority)
+        self._fee_account_cache = (fee_account, time.monotonic())
+        return fee_account
+
+    def _vault_pdas(
+        self, escrow_pk: Pubkey, vault_bump: Optional[int] = None
+    ) -> tuple[Pubkey, Pubkey]:
+        """
+        (vault, vault_authority) PDAs of an escrow, derived once per escrow.
 
-    def _parse_escrow_account(self, address: str, data) -> EscrowInfo:
-        """Parse raw escrow account data into EscrowInfo."""
-        status_map = {
-            "awaitingProvider": EscrowStatus.AWAITING_PROVIDER,
-            "active": EscrowStatus.ACTIVE,
-            "proofSubmitted": EscrowStatus.PROOF_SUBMITTED,
-            "completed": EscrowStatus.COMPLETED,
-            "disputed": EscrowStatus.DISPUTED,
-            "resolved": EscrowStatus.RESOLVED,
-            "expired": EscrowStatus.EXPIRED,
-            "cancelled": EscrowStatus.CANCELLED,
-        }
-        status_key = list(data.status.keys())[0] if hasattr(data.status, "keys") else str(data.status)
-        status = status_map.get(status_key, EscrowStatus.AWAITING_PROVIDER)
-
-        arbitrator = data.arbitrator
-        if hasattr(arbitrator, "__iter__") and not isinstance(arbitrator, (str, bytes)):
-            arbitrator_str = None
-        else:
-            arbitrator_str = str(arbitrator) if arbitrator else None
+        Pass the escrow account's stored ``vault_bump`` when it has been fetched
+        anyway; the vault is then re-derived with a single create_program_address.
+        """
+        pdas = self._pda_cache.get(escrow_pk)
+        if pdas is None:
+            if vault_bump is None:
+                vault_pda, _ = _derive_vault_pda(escrow_pk, self.program_id)
+            else:
+                vault_pda = _derive_with_bump(
+                    [_VAULT_SEED, bytes(escrow_pk)], vault_bump, self.program_id
+                )
+            vault_authority_pda, _ = _derive_vault_authority_pda(escrow_pk, self.program_id)
+            pdas = self._pda_cache[escrow_pk] = (vault_pda, vault_authority_pda)
+        return pdas
+
+    async def _escrow_parties(self, program: Program, escrow_pk: Pubkey) -> _EscrowParties:
+        """
+        Client, provider and token mint of an escrow.
 
-        def _ts(val):
-            if hasattr(val, "toNumber"):
-                return datetime.fromtimestamp(val.toNumber())
-            n = int(val) if val else 0
-            return datetime.fromtimestamp(n) if n else datetime.fromtimestamp(0)
+        Fetched once per escrow (or seeded by create_escrow / preload_escrow);
+        the fetch also seeds the vault PDAs from the stored bump.
+        """
+        parties = self._escrow_static_cache.get(escrow_pk)
+        if parties is None:
+            data = await program.account["Escrow"].fetch(escrow_pk)
+            parties = self._escrow_static_cache[escrow_pk] = _EscrowParties(
+                client=_coerce_pk(data.client),
+                provider=_coerce_pk(data.provider),
+                token_mint=_coerce_pk(data.token_mint),
+            )
+            self._vault_pdas(escrow_pk, data.vault_bump)
+        return parties
+
+    def preload_escrow(
+        self, escrow_address: str, client: str, provider: str, token_mint: str
+    ) -> None:
+        """
+        Register an escrow's parties and mint when the caller already has them
+        (e.g. from the indexer), so lifecycle calls skip the account fetch.
+        """
+        self._escrow_static_cache[_pk(escrow_address)] = _EscrowParties(
+            client=_pk(client), provider=_pk(provider), token_mint=_pk(token_mint)
+        )
 
+    def _parse_escrow_account(self, address: str, data) -> EscrowInfo:
+        """Parse raw escrow account data into EscrowInfo."""
+        acc = _accessors(data)
         return EscrowInfo(
             address=address,
-            client=str(data.client),
-            provider=str(data.provider),
-            arbitrator=arbitrator_str,
-            token_mint=str(data.token_mint),
+            client=_pk_str(data.client),
+            provider=_pk_str(data.provider),
+            arbitrator=acc.arbitrator(data.arbitrator),
+            token_mint=_pk_str(data.token_mint),
             amount=int(data.amount),
             protocol_fee_bps=int(data.protocol_fee_bps),
-            status=status,
-            verification_type=VerificationType(
-                list(data.verification_type.keys())[0]
-                if hasattr(data.verification_type, "keys")
-                else str(data.verification_type)
-            ),
-            task_hash=bytes(data.task_hash).hex() if hasattr(data.task_hash, "__len__") else str(data.task_hash),
-            deadline=_ts(data.deadline),
+            status=_STATUS_MAP.get(acc.variant(data.status), EscrowStatus.AWAITING_PROVIDER),
+            verification_type=VerificationType(acc.variant(data.verification_type)),
+            task_hash=acc.task_hash(data.task_hash),
+            deadline=acc.timestamp(data.deadline),
             grace_period=int(data.grace_period),
-            created_at=_ts(data.created_at),
+            created_at=acc.timestamp(data.created_at),
             proof_type=None,
             proof_submitted_at=None,
         )
@@ -281,23 +570,19 @@ class AgentVault:
         Builds and sends the Anchor create_escrow transaction.
         """
         params = CreateEscrowParams(**kwargs)
-        provider_pk = Pubkey.from_string(params.provider)
-        token_mint_pk = Pubkey.from_string(params.token_mint)
+        provider_pk = _pk(params.provider)
+        token_mint_pk = _pk(params.token_mint)
         arbitrator_pk = (
-            Pubkey.from_string(params.arbitrator) if params.arbitrator else Pubkey.default()
+            _pk(params.arbitrator) if params.arbitrator else Pubkey.default()
         )
         task_hash = _hash_task(
             params.task["description"], params.task.get("criteria", [])
         )
 
         escrow_pda, _ = _derive_escrow_pda(
-            self.pubkey, provider_pk, task_hash, self.program_id
+            self._pubkey_bytes, provider_pk, task_hash, self.program_id
         )
-        vault_pda, _ = _derive_vault_pda(escrow_pda, self.program_id)
-        vault_authority_pda, _ = _derive_vault_authority_pda(
-            escrow_pda, self.program_id
-        )
-        config_pda, _ = _derive_config_pda(self.program_id)
+        vault_pda, vault_authority_pda = self._vault_pdas(escrow_pda)
         client_token_account = _get_associated_token_address(
             self.pubkey, token_mint_pk
         )
@@ -309,53 +594,56 @@ class AgentVault:
 
         program = await self._get_program()
 
-        sig = await program.rpc["create_escrow"](
+        # The indexer task record doesn't depend on the tx; store it alongside the send
+        # (dropped if the send fails — see _send_with_record)
+        send = self._send(
+            program,
+            "create_escrow",
             params.amount,
             deadline,
             grace_period,
-            list(task_hash),
+            task_hash,
             verification_idl,
             criteria_count,
-            ctx=Context(
-                accounts={
-                    "client": self.pubkey,
-                    "provider": provider_pk,
-                    "arbitrator": arbitrator_pk,
-                    "config": config_pda,
-                    "escrow": escrow_pda,
-                    "token_mint": token_mint_pk,
-                    "client_token_account": client_token_account,
-                    "escrow_vault": vault_pda,
-                    "escrow_vault_authority": vault_authority_pda,
-                    "token_program": TOKEN_PROGRAM_ID,
-                    "system_program": SYS_PROGRAM_ID,
-                    "rent": RENT,
-                },
-                signers=[self.keypair],
-            ),
+            accounts={
+                "client": self.pubkey,
+                "provider": provider_pk,
+                "arbitrator": arbitrator_pk,
+                "config": self._config_pda,
+                "escrow": escrow_pda,
+                "token_mint": token_mint_pk,
+                "client_token_account": client_token_account,
+                "escrow_vault": vault_pda,
+                "escrow_vault_authority": vault_authority_pda,
+                "token_program": TOKEN_PROGRAM_ID,
+                "system_program": SYS_PROGRAM_ID,
+                "rent": RENT,
+            },
         )
-
         if self.indexer_url:
-            await self._store_task(task_hash.hex(), params.task)
+            sig = await _send_with_record(send, self._store_task(task_hash.hex(), params.task))
+        else:
+            sig = await send
+        self._escrow_static_cache[escrow_pda] = _EscrowParties(
+            client=self.pubkey, provider=provider_pk, token_mint=token_mint_pk
+        )
 
         return TransactionResult(signature=str(sig), escrow_address=str(escrow_pda))
 
     async def accept_escrow(self, escrow_address: str) -> str:
         """Accept an escrow as the provider (Agent B)."""
-        escrow_pk = Pubkey.from_string(escrow_address)
-        config_pda, _ = _derive_config_pda(self.program_id)
+        escrow_pk = _pk(escrow_address)
 
         program = await self._get_program()
 
-        sig = await program.rpc["accept_escrow"](
-            ctx=Context(
-                accounts={
-                    "provider": self.pubkey,
-                    "config": config_pda,
-                    "escrow": escrow_pk,
-                },
-                signers=[self.keypair],
-            ),
+        sig = await self._send(
+            program,
+            "accept_escrow",
+            accounts={
+                "provider": self.pubkey,
+                "config": self._config_pda,
+                "escrow": escrow_pk,
+            },
         )
         return str(sig)
 
@@ -366,176 +654,143 @@ class AgentVault:
         data: str | bytes,
     ) -> str:
         """Submit proof of task completion as the provider."""
-        escrow_pk = Pubkey.from_string(escrow_address)
-        config_pda, _ = _derive_config_pda(self.program_id)
+        escrow_pk = _pk(escrow_address)
 
         program = await self._get_program()
 
         proof_type_enum = ProofType(proof_type) if isinstance(proof_type, str) else proof_type
         proof_type_idl = _proof_type_to_idl(proof_type_enum)
 
-        raw_data = data.encode() if isinstance(data, str) else bytes(data)
-        proof_buffer = bytearray(64)
-        proof_buffer[: min(len(raw_data), 64)] = raw_data[:64]
-        proof_data = list(proof_buffer)
+        # [u8; 64] is a borsh Array; it builds from bytes as-is, no int list needed.
+        # Buffers are cut to 64 bytes (not items — cast("B") flattens typed arrays)
+        # before the copy; a full 64-byte bytes object passes through slice and
+        # ljust without being copied at all.
+        if isinstance(data, str):
+            raw_data = data.encode()[:64]
+        elif isinstance(data, bytes):
+            raw_data = data[:64]
+        else:
+            raw_data = bytes(memoryview(data).cast("B")[:64])
+        proof_data = raw_data.ljust(64, b"\0")
 
-        sig = await program.rpc["submit_proof"](
+        sig = await self._send(
+            program,
+            "submit_proof",
             proof_type_idl,
             proof_data,
-            ctx=Context(
-                accounts={
-                    "provider": self.pubkey,
-                    "config": config_pda,
-                    "escrow": escrow_pk,
-                },
-                signers=[self.keypair],
-            ),
+            accounts={
+                "provider": self.pubkey,
+                "config": self._config_pda,
+                "escrow": escrow_pk,
+            },
         )
         return str(sig)
 
     async def confirm_completion(self, escrow_address: str) -> str:
         """Confirm task completion as the client. Releases funds."""
-        escrow_pk = Pubkey.from_string(escrow_address)
-        vault_pda, _ = _derive_vault_pda(escrow_pk, self.program_id)
-        vault_authority_pda, _ = _derive_vault_authority_pda(
-            escrow_pk, self.program_id
-        )
-        config_pda, _ = _derive_config_pda(self.program_id)
-
+        escrow_pk = _pk(escrow_address)
         program = await self._get_program()
-        escrow_data = await program.account["Escrow"].fetch(escrow_pk)
-
-        provider_pk = (
-            escrow_data.provider
-            if isinstance(escrow_data.provider, Pubkey)
-            else Pubkey.from_string(str(escrow_data.provider))
-        )
-        token_mint_pk = (
-            escrow_data.token_mint
-            if isinstance(escrow_data.token_mint, Pubkey)
-            else Pubkey.from_string(str(escrow_data.token_mint))
+        # Independent reads (and the tx's blockhash): one round trip
+        parties, protocol_fee_account, blockhash = await asyncio.gather(
+            self._escrow_parties(program, escrow_pk),
+            self._get_protocol_fee_account(),
+            self._latest_blockhash(program),
         )
+        vault_pda, vault_authority_pda = self._vault_pdas(escrow_pk)
+
+        provider_pk = parties.provider
+        token_mint_pk = parties.token_mint
         provider_token_account = _get_associated_token_address(
             provider_pk, token_mint_pk
         )
         client_token_account = _get_associated_token_address(
             self.pubkey, token_mint_pk
         )
-        protocol_fee_account = await self._get_protocol_fee_account()
-
-        sig = await program.rpc["confirm_completion"](
-            ctx=Context(
-                accounts={
-                    "client": self.pubkey,
-                    "config": config_pda,
-                    "escrow": escrow_pk,
-                    "escrow_vault": vault_pda,
-                    "escrow_vault_authority": vault_authority_pda,
-                    "client_token_account": client_token_account,
-                    "provider_token_account": provider_token_account,
-                    "protocol_fee_account": protocol_fee_account,
-                    "token_program": TOKEN_PROGRAM_ID,
-                },
-                signers=[self.keypair],
-            ),
+
+        sig = await self._send(
+            program,
+            "confirm_completion",
+            accounts={
+                "client": self.pubkey,
+                "config": self._config_pda,
+                "escrow": escrow_pk,
+                "escrow_vault": vault_pda,
+                "escrow_vault_authority": vault_authority_pda,
+                "client_token_account": client_token_account,
+                "provider_token_account": provider_token_account,
+                "protocol_fee_account": protocol_fee_account,
+                "token_program": TOKEN_PROGRAM_ID,
+            },
+            blockhash=blockhash,
         )
         return str(sig)
 
     async def cancel_escrow(self, escrow_address: str) -> str:
         """Cancel an escrow before provider accepts. Full refund."""
-        escrow_pk = Pubkey.from_string(escrow_address)
-        vault_pda, _ = _derive_vault_pda(escrow_pk, self.program_id)
-        vault_authority_pda, _ = _derive_vault_authority_pda(
-            escrow_pk, self.program_id
-        )
-        config_pda, _ = _derive_config_pda(self.program_id)
-
+        escrow_pk = _pk(escrow_address)
         program = await self._get_program()
-        escrow_data = await program.account["Escrow"].fetch(escrow_pk)
-
-        token_mint_pk = (
-            escrow_data.token_mint
-            if isinstance(escrow_data.token_mint, Pubkey)
-            else Pubkey.from_string(str(escrow_data.token_mint))
+        parties, blockhash = await asyncio.gather(
+            self._escrow_parties(program, escrow_pk), self._latest_blockhash(program)
         )
+        vault_pda, vault_authority_pda = self._vault_pdas(escrow_pk)
+
+        token_mint_pk = parties.token_mint
         client_token_account = _get_associated_token_address(
             self.pubkey, token_mint_pk
         )
 
-        sig = await program.rpc["cancel_escrow"](
-            ctx=Context(
-                accounts={
-                    "client": self.pubkey,
-                    "config": config_pda,
-                    "escrow": escrow_pk,
-                    "escrow_vault": vault_pda,
-                    "escrow_vault_authority": vault_authority_pda,
-                    "client_token_account": client_token_account,
-                    "token_program": TOKEN_PROGRAM_ID,
-                },
-                signers=[self.keypair],
-            ),
+        sig = await self._send(
+            program,
+            "cancel_escrow",
+            accounts={
+                "client": self.pubkey,
+                "config": self._config_pda,
+                "escrow": escrow_pk,
+                "escrow_vault": vault_pda,
+                "escrow_vault_authority": vault_authority_pda,
+                "client_token_account": client_token_account,
+                "token_program": TOKEN_PROGRAM_ID,
+            },
+            blockhash=blockhash,
         )
         return str(sig)
 
     async def raise_dispute(self, escrow_address: str, reason: str) -> str:
         """Raise a dispute on an escrow."""
-        escrow_pk = Pubkey.from_string(escrow_address)
-        config_pda, _ = _derive_config_pda(self.program_id)
-
-        if self.indexer_url:
-            await self._http.post(
-                f"{self.indexer_url}/disputes",
-                json={
-                    "escrow_address": escrow_address,
-                    "raised_by": str(self.pubkey),
-                    "reason": reason,
-                },
-            )
+        escrow_pk = _pk(escrow_address)
 
         program = await self._get_program()
 
-        sig = await program.rpc["raise_dispute"](
-            ctx=Context(
-                accounts={
-                    "raiser": self.pubkey,
-                    "config": config_pda,
-                    "escrow": escrow_pk,
-                },
-                signers=[self.keypair],
-            ),
+        send = self._send(
+            program,
+            "raise_dispute",
+            accounts={
+                "raiser": self.pubkey,
+                "config": self._config_pda,
+                "escrow": escrow_pk,
+            },
         )
+        if self.indexer_url:
+            sig = await _send_with_record(send, self._store_dispute(escrow_address, reason))
+        else:
+            sig = await send
         return str(sig)
 
     async def resolve_dispute(
         self, escrow_address: str, ruling: DisputeRuling
     ) -> str:
         """Resolve a dispute as the arbitrator."""
-        escrow_pk = Pubkey.from_string(escrow_address)
-        vault_pda, _ = _derive_vault_pda(escrow_pk, self.program_id)
-        vault_authority_pda, _ = _derive_vault_authority_pda(
-            escrow_pk, self.program_id
-        )
-        config_pda, _ = _derive_config_pda(self.program_id)
-
+        escrow_pk = _pk(escrow_address)
         program = await self._get_program()
-        escrow_data = await program.account["Escrow"].fetch(escrow_pk)
-
-        client_pk = (
-            escrow_data.client
-            if isinstance(escrow_data.client, Pubkey)
-            else Pubkey.from_string(str(escrow_data.client))
-        )
-        provider_pk = (
-            escrow_data.provider
-            if isinstance(escrow_data.provider, Pubkey)
-            else Pubkey.from_string(str(escrow_data.provider))
-        )
-        token_mint_pk = (
-            escrow_data.token_mint
-            if isinstance(escrow_data.token_mint, Pubkey)
-            else Pubkey.from_string(str(escrow_data.token_mint))
+        # Independent reads (and the tx's blockhash): one round trip
+        parties, protocol_fee_account, blockhash = await asyncio.gather(
+            self._escrow_parties(program, escrow_pk),
+            self._get_protocol_fee_account(),
+            self._latest_blockhash(program),
         )
+        vault_pda, vault_authority_pda = self._vault_pdas(escrow_pk)
+
+        client_pk, provider_pk, token_mint_pk = parties
         client_token_account = _get_associated_token_address(
             client_pk, token_mint_pk
         )
@@ -545,28 +800,27 @@ class AgentVault:
         arbitrator_token_account = _get_associated_token_address(
             self.pubkey, token_mint_pk
         )
-        protocol_fee_account = await self._get_protocol_fee_account()
 
         ruling_idl = _dispute_ruling_to_idl(ruling)
 
-        sig = await program.rpc["resolve_dispute"](
+        sig = await self._send(
+            program,
+            "resolve_dispute",
             ruling_idl,
-            ctx=Context(
-                accounts={
-                    "arbitrator": self.pubkey,
-                    "client": client_pk,
-                    "config": config_pda,
-                    "escrow": escrow_pk,
-                    "escrow_vault": vault_pda,
-                    "escrow_vault_authority": vault_authority_pda,
-                    "client_token_account": client_token_account,
-                    "provider_token_account": provider_token_account,
-                    "arbitrator_token_account": arbitrator_token_account,
-                    "protocol_fee_account": protocol_fee_account,
-                    "token_program": TOKEN_PROGRAM_ID,
-                },
-                signers=[self.keypair],
-            ),
+            accounts={
+                "arbitrator": self.pubkey,
+                "client": client_pk,
+                "config": self._config_pda,
+                "escrow": escrow_pk,
+                "escrow_vault": vault_pda,
+                "escrow_vault_authority": vault_authority_pda,
+                "client_token_account": client_token_account,
+                "provider_token_account": provider_token_account,
+                "arbitrator_token_account": arbitrator_token_account,
+                "protocol_fee_account": protocol_fee_account,
+                "token_program": TOKEN_PROGRAM_ID,
+            },
+            blockhash=blockhash,
         )
         return str(sig)
 
@@ -582,15 +836,27 @@ class AgentVault:
                     f"{self.indexer_url}/escrows/{escrow_address}"
                 )
                 resp.raise_for_status()
-                return EscrowInfo(**resp.json())
+                # Indexer returns {...escrow, task, proofs}; extract escrow fields
+                return _parse_indexer_rows((_json_loads(resp.content),))[0]
             except httpx.HTTPError:
                 pass
 
         program = await self._get_program()
-        escrow_pk = Pubkey.from_string(escrow_address)
+        escrow_pk = _pk(escrow_address)
         data = await program.account["Escrow"].fetch(escrow_pk)
         return self._parse_escrow_account(escrow_address, data)
 
+    async def get_escrows(self, escrow_addresses: list[str]) -> list[Optional[EscrowInfo]]:
+        """Get many escrows via batched getMultipleAccounts. Missing accounts are None."""
+        program = await self._get_program()
+        accounts = await program.account["Escrow"].fetch_multiple(
+            [_pk(a) for a in escrow_addresses]
+        )
+        return [
+            self._parse_escrow_account(address, data) if data is not None else None
+            for address, data in zip(escrow_addresses, accounts)
+        ]
+
     async def get_agent_stats(self, agent_address: str) -> AgentStats:
         """Get reputation stats for an agent."""
         if not self.indexer_url:
@@ -600,7 +866,7 @@ class AgentVault:
             f"{self.indexer_url}/agents/{agent_address}/stats"
         )
         resp.raise_for_status()
-        return AgentStats(**resp.json())
+        return _parse_agent_stats(_json_loads(resp.content))
 
     async def list_escrows(
         self,
@@ -612,121 +878,138 @@ class AgentVault:
     ) -> list[EscrowInfo]:
         """List escrows with optional filters."""
         if self.indexer_url:
-            params = {"limit": limit, "offset": offset}
-            if status:
-                params["status"] = status
-            if client:
-                params["client"] = client
-            if provider:
-                params["provider"] = provider
-
-            resp = await self._http.get(f"{self.indexer_url}/escrows", params=params)
-            resp.raise_for_status()
-            return [EscrowInfo(**e) for e in resp.json()]
+            return await self._indexer_escrows(status, client, provider, limit, offset)
 
-        program = await self._get_program()
-        accounts = await program.account["Escrow"].all()
-        result = [
-            self._parse_escrow_account(str(a.public_key), a.account)
-            for a in accounts
-        ]
-        if status:
-            result = [e for e in result if e.status.value == status]
+        # Party filters run on the RPC node (memcmp on the account bytes); status is
+        # checked on the raw account, so only the returned page is fully parsed.
+        filters = []
         if client:
-            result = [e for e in result if e.client == client]
+            filters.append(MemcmpOpts(offset=ESCROW_CLIENT_OFFSET, bytes=client))
         if provider:
-            result = [e for e in result if e.provider == provider]
-        return result[offset : offset + limit]
+            filters.append(MemcmpOpts(offset=ESCROW_PROVIDER_OFFSET, bytes=provider))
+        program = await self._get_program()
+        accounts = await program.account["Escrow"].all(filters=filters or None)
+        if status:
+            accounts = (a for a in accounts if _escrow_status(a.account).value == status)
+        return [
+            self._parse_escrow_account(_pk_str(a.public_key), a.account)
+            for a in islice(accounts, offset, offset + limit)
+        ]
+
+    async def iter_escrows(
+        self,
+        status: Optional[str] = None,
+        client: Optional[str] = None,
+        provider: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: int = 2,
+    ) -> AsyncIterator[EscrowInfo]:
+        """
+        Iterate over all escrows matching the filters.
+
+        With an indexer, up to ``prefetch`` pages are requested ahead of the one
+        being consumed, so page round trips overlap with the caller's work.
+        Without one, the filtered RPC scan is a single call anyway.
+        """
+        if not self.indexer_url:
+            for escrow in await self.list_escrows(status, client, provider, limit=sys.maxsize):
+                yield escrow
+            return
+
+        def fetch(offset: int) -> asyncio.Task:
+            return asyncio.ensure_future(
+                self._indexer_escrows(status, client, provider, page_size, offset)
+            )
+
+        pending = deque(fetch(i * page_size) for i in range(max(prefetch, 1)))
+        next_offset = len(pending) * page_size
+        try:
+            while pending:
+                page = await pending.popleft()
+                if len(page) < page_size:
+                    # Last page: anything still in flight is past the end
+                    for task in pending:
+                        task.cancel()
+                    pending.clear()
+                else:
+                    pending.append(fetch(next_offset))
+                    next_offset += page_size
+                for escrow in page:
+                    yield escrow
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
     async def expire_escrow(self, escrow_address: str) -> str:
         """Expire an escrow after deadline + grace period. Anyone can call."""
-        escrow_pk = Pubkey.from_string(escrow_address)
-        vault_pda, _ = _derive_vault_pda(escrow_pk, self.program_id)
-        vault_authority_pda, _ = _derive_vault_authority_pda(
-            escrow_pk, self.program_id
-        )
-        config_pda, _ = _derive_config_pda(self.program_id)
-
+        escrow_pk = _pk(escrow_address)
         program = await self._get_program()
-        escrow_data = await program.account["Escrow"].fetch(escrow_pk)
-
-        client_pk = (
-            escrow_data.client
-            if isinstance(escrow_data.client, Pubkey)
-            else Pubkey.from_string(str(escrow_data.client))
-        )
-        token_mint_pk = (
-            escrow_data.token_mint
-            if isinstance(escrow_data.token_mint, Pubkey)
-            else Pubkey.from_string(str(escrow_data.token_mint))
+        parties, blockhash = await asyncio.gather(
+            self._escrow_parties(program, escrow_pk), self._latest_blockhash(program)
         )
+        vault_pda, vault_authority_pda = self._vault_pdas(escrow_pk)
+
+        client_pk = parties.client
+        token_mint_pk = parties.token_mint
         client_token_account = _get_associated_token_address(
             client_pk, token_mint_pk
         )
 
-        sig = await program.rpc["expire_escrow"](
-            ctx=Context(
-                accounts={
-                    "caller": self.pubkey,
-                    "config": config_pda,
-                    "escrow": escrow_pk,
-                    "escrow_vault": vault_pda,
-                    "escrow_vault_authority": vault_authority_pda,
-                    "client_token_account": client_token_account,
-                    "client": client_pk,
-                    "token_program": TOKEN_PROGRAM_ID,
-                },
-                signers=[self.keypair],
-            ),
+        sig = await self._send(
+            program,
+            "expire_escrow",
+            accounts={
+                "caller": self.pubkey,
+                "config": self._config_pda,
+                "escrow": escrow_pk,
+                "escrow_vault": vault_pda,
+                "escrow_vault_authority": vault_authority_pda,
+                "client_token_account": client_token_account,
+                "client": client_pk,
+                "token_program": TOKEN_PROGRAM_ID,
+            },
+            blockhash=blockhash,
         )
         return str(sig)
 
     async def provider_release(self, escrow_address: str) -> str:
         """Provider voluntarily releases funds back to client."""
-        escrow_pk = Pubkey.from_string(escrow_address)
-        vault_pda, _ = _derive_vault_pda(escrow_pk, self.program_id)
-        vault_authority_pda, _ = _derive_vault_authority_pda(
-            escrow_pk, self.program_id
-        )
-        config_pda, _ = _derive_config_pda(self.program_id)
-
+        escrow_pk = _pk(escrow_address)
         program = await self._get_program()
-        escrow_data = await program.account["Escrow"].fetch(escrow_pk)
-
-        client_pk = (
-            escrow_data.client
-            if isinstance(escrow_data.client, Pubkey)
-            else Pubkey.from_string(str(escrow_data.client))
-        )
-        token_mint_pk = (
-            escrow_data.token_mint
-            if isinstance(escrow_data.token_mint, Pubkey)
-            else Pubkey.from_string(str(escrow_data.token_mint))
+        # Independent reads (and the tx's blockhash): one round trip
+        parties, protocol_fee_account, blockhash = await asyncio.gather(
+            self._escrow_parties(program, escrow_pk),
+            self._get_protocol_fee_account(),
+            self._latest_blockhash(program),
         )
+        vault_pda, vault_authority_pda = self._vault_pdas(escrow_pk)
+
+        client_pk = parties.client
+        token_mint_pk = parties.token_mint
         provider_token_account = _get_associated_token_address(
             self.pubkey, token_mint_pk
         )
         client_token_account = _get_associated_token_address(
             client_pk, token_mint_pk
         )
-        protocol_fee_account = await self._get_protocol_fee_account()
-
-        sig = await program.rpc["provider_release"](
-            ctx=Context(
-                accounts={
-                    "provider": self.pubkey,
-                    "config": config_pda,
-                    "escrow": escrow_pk,
-                    "escrow_vault": vault_pda,
-                    "escrow_vault_authority": vault_authority_pda,
-                    "provider_token_account": provider_token_account,
-                    "client_token_account": client_token_account,
-                    "protocol_fee_account": protocol_fee_account,
-                    "client": client_pk,
-                    "token_program": TOKEN_PROGRAM_ID,
-                },
-                signers=[self.keypair],
-            ),
+
+        sig = await self._send(
+            program,
+            "provider_release",
+            accounts={
+                "provider": self.pubkey,
+                "config": self._config_pda,
+                "escrow": escrow_pk,
+                "escrow_vault": vault_pda,
+                "escrow_vault_authority": vault_authority_pda,
+                "provider_token_account": provider_token_account,
+                "client_token_account": client_token_account,
+                "protocol_fee_account": protocol_fee_account,
+                "client": client_pk,
+                "token_program": TOKEN_PROGRAM_ID,
+            },
+            blockhash=blockhash,
         )
         return str(sig)
 
@@ -734,10 +1017,93 @@ class AgentVault:
         """Not implemented on Solana — use Base chain for this action."""
         raise NotImplementedError("expire_dispute is not supported on Solana")
 
+    async def subscribe_escrow(self, escrow_address: str, callback) -> None:
+        """Not implemented on Solana — use Base chain for this action."""
+        raise NotImplementedError("subscribe_escrow is not supported on Solana")
+
     # ──────────────────────────────────────────────────────
     # INTERNAL
     # ──────────────────────────────────────────────────────
 
+    def _build_ix(self, program: Program, name: str, args: tuple, accounts: dict) -> Instruction:
+        """
+        Encode an instruction from its cached template: discriminator + borsh
+        args, accounts in IDL order. Same output as program.instruction[name].
+        """
+        try:
+            tpl = self._ix_templates[name]
+        except KeyError:
+            tpl = self._ix_templates[name] = _build_ix_template(program, name)
+        if tpl is None:
+            return program.instruction[name](*args, ctx=Context(accounts=accounts))
+        if len(args) != len(tpl.arg_names):
+            raise ArgsError(f"{name} takes {len(tpl.arg_names)} args, got {len(args)}")
+        return Instruction(
+            program_id=self.program_id,
+            data=tpl.discriminator + tpl.layout.build(dict(zip(tpl.arg_names, args))),
+            accounts=[
+                AccountMeta(pubkey=accounts[acc], is_signer=signer, is_writable=writable)
+                for acc, writable, signer in tpl.accounts
+            ],
+        )
+
+    async def _latest_blockhash(self, program: Program) -> Hash:
+        resp = await program.provider.connection.get_latest_blockhash(Confirmed)
+        return resp.value.blockhash
+
+    async def _send(
+        self,
+        program: Program,
+        name: str,
+        *args,
+        accounts: dict,
+        blockhash: Optional[Hash] = None,
+    ) -> Signature:
+        """
+        Sign and send one program instruction, paid for by the keypair.
+
+        Replaces program.rpc[name]: the instruction comes from _build_ix, and
+        callers that read accounts first pass a blockhash fetched alongside
+        those reads. Program errors are translated as anchorpy does.
+        """
+        ix = self._build_ix(program, name, args, accounts)
+        if blockhash is None:
+            blockhash = await self._latest_blockhash(program)
+        tx = VersionedTransaction(
+            Message.new_with_blockhash([ix], self.pubkey, blockhash), [self.keypair]
+        )
+        try:
+            return await program.provider.send(tx)
+        except RPCException as e:
+            if self._idl_errors is None:
+                errors = program.idl.errors or []
+                self._idl_errors = {err.code: err.msg or err.name for err in errors}
+            translated = ProgramError.parse(e.args[0], self._idl_errors, self.program_id)
+            if translated is not None:
+                raise translated from e
+            raise
+
+    async def _indexer_escrows(
+        self,
+        status: Optional[str],
+        client: Optional[str],
+        provider: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> list[EscrowInfo]:
+        """One page of GET /escrows; filters are applied by the indexer."""
+        params = {"limit": limit, "offset": offset}
+        if status:
+            params["status"] = status
+        if client:
+            params["client"] = client
+        if provider:
+            params["provider"] = provider
+
+        resp = await self._http.get(f"{self.indexer_url}/escrows", params=params)
+        resp.raise_for_status()
+        return _parse_indexer_rows(_json_loads(resp.content))
+
     async def _store_task(self, task_hash: str, task: dict) -> None:
         """Store task description off-chain via indexer."""
         try:
@@ -751,7 +1117,34 @@ class AgentVault:
                 },
             )
         except Exception as e:
-            print(f"Warning: failed to store task off-chain: {e}")
+            logger.warning("failed to store task %s off-chain: %s", task_hash, e)
+
+    async def _store_dispute(self, escrow_address: str, reason: str) -> None:
+        """Record the dispute reason off-chain via indexer."""
+        try:
+            await self._http.post(
+                f"{self.indexer_url}/disputes",
+                json={
+                    "escrow_address": escrow_address,
+                    "raised_by": str(self.pubkey),
+                    "reason": reason,
+                },
+            )
+        except Exception as e:
+            logger.warning(
+                "failed to store dispute reason for escrow %s off-chain: %s", escrow_address, e
+            )
+
+    async def connect(self) -> None:
+        """
+        Build the Anchor program up front instead of on the first call.
+
+        Also reads the protocol config once, which opens the RPC connection,
+        so the first lifecycle call doesn't pay for the IDL fetch or handshakes.
+        Optional and explicit; ``async with`` does no network I/O on entry.
+        """
+        await self._get_program()
+        await self._get_protocol_fee_account()
 
     async def close(self) -> None:
         """Close the HTTP client and connection."""
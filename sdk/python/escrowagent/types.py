@@ -40,21 +40,21 @@ class CriterionType(str, Enum):
     CUSTOM = "Custom"
 
 
-@dataclass
+@dataclass(slots=True)
 class DisputeRuling:
     ruling_type: str  # "PayClient", "PayProvider", "Split"
     client_bps: int = 0
     provider_bps: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskCriterion:
     type: CriterionType
     description: str
     target_value: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CreateEscrowParams:
     provider: str
     amount: int
@@ -66,13 +66,13 @@ class CreateEscrowParams:
     arbitrator: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SubmitProofParams:
     proof_type: ProofType
     data: str | bytes
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TransactionResult:
     """Result of a transaction submission."""
 
@@ -80,7 +80,7 @@ class TransactionResult:
     escrow_address: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EscrowInfo:
     address: str
     client: str
@@ -99,7 +99,7 @@ class EscrowInfo:
     proof_submitted_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentStats:
     address: str
     total_escrows: int = 0
@@ -117,7 +117,7 @@ class AgentStats:
 # ──────────────────────────────────────────────────────
 
 
-@dataclass
+@dataclass(slots=True)
 class InitializeProtocolParams:
     """Parameters for initializing the protocol config (admin only)."""
 
@@ -128,7 +128,7 @@ class InitializeProtocolParams:
     max_escrow_amount: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigUpdate:
     """
     Optional updates for protocol config. All fields optional — pass None to keep current value.
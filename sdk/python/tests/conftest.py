@@ -0,0 +1,86 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class RpcError(Exception):
+    """Raised by a FakeNode result callable to answer with a JSON-RPC error."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class DropConnection(Exception):
+    """Raised by a FakeNode result callable to close the socket without answering."""
+
+
+class FakeNode:
+    """
+    Minimal keep-alive JSON-RPC node on a background thread.
+
+    ``results`` maps method -> result (or a callable taking the params, which
+    may raise RpcError or DropConnection); unknown methods answer with a
+    JSON-RPC error.
+    ``calls`` records every method received, in order.
+    """
+
+    def __init__(self):
+        self.results: dict = {"eth_chainId": "0x2105", "eth_blockNumber": "0x2a"}
+        self.calls: list[str] = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                try:
+                    if isinstance(request, list):
+                        body = [node.answer(r) for r in request]
+                    else:
+                        body = node.answer(request)
+                except DropConnection:
+                    self.close_connection = True
+                    return
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def answer(self, request: dict) -> dict:
+        method = request["method"]
+        self.calls.append(method)
+        if method not in self.results:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": method}}
+        result = self.results[method]
+        if callable(result):
+            try:
+                result = result(request.get("params"))
+            except RpcError as e:
+                error = {"code": e.code, "message": e.message}
+                return {"jsonrpc": "2.0", "id": request["id"], "error": error}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def node():
+    fake = FakeNode()
+    yield fake
+    fake.close()
@@ -0,0 +1,219 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from eth_account.typed_transactions import TypedTransaction
+from hexbytes import HexBytes
+from web3.exceptions import Web3RPCError
+
+from escrowagent.base import BaseEscrowClient, shutdown_all
+
+from conftest import DropConnection, RpcError
+
+PRIVATE_KEY = "0x" + "42" * 32
+CONTRACT = "0x" + "ab" * 20
+
+
+def _client(node) -> BaseEscrowClient:
+    return BaseEscrowClient(rpc_url=node.url, private_key=PRIVATE_KEY, contract_address=CONTRACT)
+
+
+def test_shared_client_survives_new_event_loop(node):
+    # Each asyncio.run() is a fresh loop; the pooled httpx client of the first
+    # one must not be reused by the second
+    async def read():
+        return await _client(node).w3.eth.block_number
+
+    assert asyncio.run(read()) == 42
+    assert asyncio.run(read()) == 42
+
+    async def close():
+        await shutdown_all()
+
+    asyncio.run(close())
+
+
+def test_dropped_read_is_retried(node):
+    attempts = []
+
+    def block_number(params):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise DropConnection
+        return "0x2a"
+
+    node.results["eth_blockNumber"] = block_number
+
+    async def run():
+        result = await _client(node).w3.eth.block_number
+        await shutdown_all()
+        return result
+
+    assert asyncio.run(run()) == 42
+    assert len(attempts) == 2
+
+
+def test_disconnect_drains_queued_batch(node):
+    async def run():
+        w3 = _client(node).w3
+        w3.provider.batch_window = 60
+        reads = asyncio.gather(*(w3.eth.get_block_number() for _ in range(3)))
+        await asyncio.sleep(0.05)
+        await w3.provider.disconnect()
+        result = await reads
+        await shutdown_all()
+        return result
+
+    assert asyncio.run(run()) == [42, 42, 42]
+
+
+def _tx(client: BaseEscrowClient) -> dict:
+    return {
+        "to": client.contract_address,
+        "value": 0,
+        "data": b"",
+        "gas": 100_000,
+        "maxFeePerGas": 2_000_000_000,
+        "maxPriorityFeePerGas": 1_000_000,
+        "chainId": 0x2105,
+        "type": 2,
+    }
+
+
+def test_send_timeout_resyncs_nonce(node):
+    # The node takes the tx but answers too late: the nonce must not be reused
+    pending = {"count": 5}
+
+    def send_raw(params):
+        pending["count"] += 1
+        if pending["count"] == 6:
+            time.sleep(0.5)
+        return "0x" + "11" * 32
+
+    node.results["eth_getTransactionCount"] = lambda params: hex(pending["count"])
+    node.results["eth_sendRawTransaction"] = send_raw
+
+    async def run():
+        client = _client(node)
+        client._http.timeout = httpx.Timeout(0.2)
+        with pytest.raises(httpx.TimeoutException):
+            await client._sign_and_send(_tx(client))
+        assert client._nonce is None
+        await client._sign_and_send(_tx(client))
+        nonce = client._nonce
+        await shutdown_all()
+        return nonce
+
+    assert asyncio.run(run()) == 7
+
+
+def test_rejected_send_reuses_nonce(node):
+    def send_raw(params):
+        raise RpcError(-32000, "insufficient funds for gas * price + value")
+
+    node.results["eth_getTransactionCount"] = "0x5"
+    node.results["eth_sendRawTransaction"] = send_raw
+
+    async def run():
+        client = _client(node)
+        with pytest.raises(Web3RPCError):
+            await client._sign_and_send(_tx(client))
+        nonce = client._nonce
+        await shutdown_all()
+        return nonce
+
+    assert asyncio.run(run()) == 5
+
+
+def _dispute_client(node, send_raw):
+    node.results["eth_getTransactionCount"] = "0x0"
+    node.results["eth_estimateGas"] = hex(50_000)
+    node.results["eth_sendRawTransaction"] = send_raw
+    node.results["eth_getTransactionReceipt"] = {
+        "transactionHash": "0x" + "11" * 32,
+        "blockHash": "0x" + "22" * 32,
+        "blockNumber": "0x1",
+        "transactionIndex": "0x0",
+        "status": "0x1",
+        "gasUsed": "0x5208",
+        "cumulativeGasUsed": "0x5208",
+        "logs": [],
+    }
+    client = BaseEscrowClient(
+        rpc_url=node.url,
+        private_key=PRIVATE_KEY,
+        contract_address=CONTRACT,
+        indexer_url=node.url,
+    )
+    client._store_fees(1_000_000_000, 1_000_000)
+    return client
+
+
+def _recording_post(events: list, delay: float):
+    async def post(escrow_address, reason):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        events.append("posted")
+
+    return post
+
+
+def test_failed_dispute_drops_reason_post(node):
+    def send_raw(params):
+        raise RpcError(3, "execution reverted")
+
+    async def run():
+        events: list = []
+        client = _dispute_client(node, send_raw)
+        # Still in flight when the send fails
+        client._post_dispute_reason = _recording_post(events, delay=5)
+        with pytest.raises(Web3RPCError):
+            await client.raise_dispute(1, "provider went silent")
+        await shutdown_all()
+        return events
+
+    assert asyncio.run(run()) == ["cancelled"]
+
+
+def test_dispute_reason_posted_on_success(node):
+    async def run():
+        events: list = []
+        client = _dispute_client(node, lambda params: "0x" + "11" * 32)
+        client._post_dispute_reason = _recording_post(events, delay=0)
+        tx_hash = await client.raise_dispute(1, "provider went silent")
+        await shutdown_all()
+        return tx_hash, events
+
+    assert asyncio.run(run()) == ("11" * 32, ["posted"])
+
+
+def test_gas_estimated_once_then_reused(node):
+    sent_gas = []
+
+    def send_raw(params):
+        tx = TypedTransaction.from_bytes(HexBytes(params[0])).as_dict()
+        sent_gas.append(tx["gas"])
+        return "0x" + "11" * 32
+
+    async def run():
+        client = _dispute_client(node, send_raw)
+        await client.raise_dispute(1)
+        await client.raise_dispute(2)
+        # A reverted tx sent with the reused limit drops it
+        node.results["eth_getTransactionReceipt"] = {
+            **node.results["eth_getTransactionReceipt"],
+            "status": "0x0",
+        }
+        with pytest.raises(RuntimeError, match="reverted"):
+            await client.raise_dispute(3)
+        dropped = ("raiseDispute",) not in client._gas_cache
+        await shutdown_all()
+        return dropped
+
+    assert asyncio.run(run())
+    assert sent_gas == [50_000, 100_000, 100_000]
+    assert node.calls.count("eth_estimateGas") == 1